@@ -0,0 +1,79 @@
+import os
+import shutil
+
+import pandas as pd
+
+from benchmarks.synthetic import DATASETS, generate
+from utils.datasets import PROCUREMENT_PATH, SUPERSTORE_PATH, SUPPLYCHAIN_PATH
+
+# Scaled copies of the datasets, one directory per scale factor
+WORK_DIR = os.path.join(".cache", "benchmarks")
+
+# Rows of a 1x synthetic dataset, used for the sources missing from the source directory
+SYNTHETIC_ROWS = {SUPPLYCHAIN_PATH: 180_519, PROCUREMENT_PATH: 200_000, SUPERSTORE_PATH: 9_994}
+
+
+def _is_fresh(target, source):
+    return os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(source)
+
+
+def scale_csv(source, target, scale):
+    """
+    Write `source` to `target` with its data rows repeated `scale` times, copying it line by line.
+    """
+    with open(source, "rb") as f, open(target, "wb") as out:
+        out.write(f.readline())
+        body = f.tell()
+        for _ in range(scale):
+            f.seek(body)
+            line = b""
+            for line in f:
+                out.write(line)
+            # Keeps the copies apart when the last row has no line break
+            if line and not line.endswith(b"\n"):
+                out.write(b"\n")
+
+
+def scale_excel(source, target, scale):
+    """
+    Write the first sheet of `source` to `target` as XLSX with its rows repeated `scale` times.
+
+    `pd.read_excel` detects the format from the file contents, so the target keeps the name
+    the page loads (e.g. `Superstore.xls`).
+    """
+    df = pd.read_excel(source)
+    pd.concat([df] * scale, ignore_index=True).to_excel(target, index=False, engine="openpyxl")
+
+
+def prepare(scale, source_dir=".", work_dir=WORK_DIR):
+    """
+    Return a directory holding every dataset found in `source_dir`, scaled `scale` times.
+
+    Each file keeps the name the pages load it by, so a page run from that directory reads the
+    scaled data (and keeps its snapshots there). Files are only rewritten when their source is newer.
+    Datasets missing from `source_dir` are generated by `benchmarks.synthetic` instead.
+    """
+    target_dir = os.path.join(work_dir, f"x{scale}")
+    os.makedirs(target_dir, exist_ok=True)
+    datasets = {path: dataset for dataset, (_, path) in DATASETS.items()}
+    for name in (SUPPLYCHAIN_PATH, PROCUREMENT_PATH, SUPERSTORE_PATH):
+        source = os.path.join(source_dir, name)
+        target = os.path.join(target_dir, name)
+        # Marks a generated file, so it is replaced once a real source turns up
+        marker = f"{target}.synthetic"
+        if not os.path.exists(source):
+            if not (os.path.exists(target) and os.path.exists(marker)):
+                generate(datasets[name], SYNTHETIC_ROWS[name] * scale, target)
+                open(marker, "w").close()
+            continue
+        if os.path.exists(marker):
+            os.remove(marker)
+        elif _is_fresh(target, source):
+            continue
+        if scale == 1:
+            shutil.copyfile(source, target)
+        elif name.endswith(".csv"):
+            scale_csv(source, target, scale)
+        else:
+            scale_excel(source, target, scale)
+    return os.path.abspath(target_dir)
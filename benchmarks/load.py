@@ -0,0 +1,326 @@
+"""
+Load-test the dashboard with concurrent sessions against a headless Streamlit server.
+
+    python -m benchmarks.load --data DIR [--sessions 1 4 16] [--steps 30] [--think 0]
+
+DIR is the directory the app is run from (it holds the datasets and `assets/`). A server for
+`streamlit_app.py` is started there, and every session connects to it over the app's websocket
+like a browser tab: it switches pages through the navigation, picks date ranges, toggles the
+region multiselect and flips the supply chain view radio, each step a full rerun. For every
+session count the latency of those reruns (p50/p95/p99), the reruns served per second, the
+server's resident memory and the steps skipped because their page lacked the widget are reported.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.Common_pb2 import SInt64Array, StringArray
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.httpclient import AsyncHTTPClient
+from tornado.websocket import websocket_connect
+
+from benchmarks.data import WORK_DIR
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app.py")
+RESULTS_PATH = os.path.join(WORK_DIR, "load.json")
+SERVER_LOG_PATH = os.path.join(WORK_DIR, "load-server.log")
+
+SESSIONS = (1, 4, 16)
+PORT = 8599
+STARTUP_SECONDS = 60
+MEMORY_INTERVAL = 0.25
+
+# Figures and tables of the largest pages are sent as single messages of several MB
+MAX_MESSAGE_BYTES = 2**30
+
+# Script runs that end a rerun; an early finish means another rerun replaced it
+FINISHED = (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR)
+
+# Steps of a session, repeated in this order: a page switch by its navigation title, or a widget change
+TOUR = [
+    ("page", "Sales Dashboard"), ("dates", None), ("regions", None), ("regions", None),
+    ("page", "Supply Chain Analysis"), ("view", None), ("view", None), ("dates", None),
+    ("page", "Procurement Analysis"),
+    ("page", "About Me"),
+]
+
+WIDGET_TYPES = ("date_input", "multiselect", "radio")
+
+
+def _date(value):
+    return datetime.datetime.strptime(value, "%Y/%m/%d").date()
+
+
+class Session:
+    """
+    One browser-like client of the server: it keeps the navigation's pages, the widgets of the
+    page it is on and the values it gave them, which are sent with every rerun.
+    """
+
+    def __init__(self, host, port, seed):
+        self.base = f"{host}:{port}"
+        self.rng = np.random.default_rng(seed)
+        self.pages = {}
+        self.page_hash = ""
+        self.widgets = {}
+        self.states = {}
+        self.cached = {}
+        self.errors = []
+        self.skipped = []
+        self.connection = None
+
+    async def connect(self):
+        self.connection = await websocket_connect(f"ws://{self.base}/_stcore/stream",
+                                                  max_message_size=MAX_MESSAGE_BYTES)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+    async def rerun(self):
+        """
+        Rerun the current page with the session's widget values and return the seconds until it finished.
+        """
+        msg = BackMsg()
+        msg.rerun_script.page_script_hash = self.page_hash
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        self.widgets = {}
+        start = time.perf_counter()
+        await self.connection.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            payload = await self.connection.read_message()
+            if payload is None:
+                raise ConnectionError("the server closed the session")
+            msg = await self._resolve(payload)
+            kind = msg.WhichOneof("type")
+            if kind == "script_finished" and msg.script_finished in FINISHED:
+                return time.perf_counter() - start
+            if kind == "navigation":
+                self.pages = {page.page_name: page.page_script_hash for page in msg.navigation.app_pages}
+                self.page_hash = msg.navigation.page_script_hash
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                self._element(msg.delta.new_element)
+
+    async def _resolve(self, payload):
+        # Large messages already sent to this session come back as a reference to their hash,
+        # which a browser resolves from its own cache (or the server's) just the same
+        msg = ForwardMsg()
+        msg.ParseFromString(payload)
+        if msg.ref_hash:
+            if msg.ref_hash not in self.cached:
+                response = await AsyncHTTPClient().fetch(f"http://{self.base}/_stcore/message?hash={msg.ref_hash}")
+                cached = ForwardMsg()
+                cached.ParseFromString(response.body)
+                self.cached[msg.ref_hash] = cached
+            msg = self.cached[msg.ref_hash]
+        elif msg.metadata.cacheable:
+            self.cached[msg.hash] = msg
+        return msg
+
+    def _element(self, element):
+        kind = element.WhichOneof("type")
+        if kind in WIDGET_TYPES:
+            widget = getattr(element, kind)
+            self.widgets[widget.label] = widget
+        elif kind == "exception":
+            self.errors.append(element.exception.message)
+
+    async def step(self, action, target):
+        """
+        Apply one tour step and rerun; return the rerun's seconds, or None when the page lacks the widget.
+        """
+        if action == "page":
+            if target not in self.pages:
+                return None
+            self.page_hash = self.pages[target]
+            self.states = {}
+        elif action == "dates":
+            start, end = self.widgets.get("Start Date"), self.widgets.get("End Date")
+            if start is None or end is None:
+                return None
+            # Any range inside the inputs' bounds, which the pages set to the data's span
+            first, last = _date(start.min), _date(end.max)
+            days = sorted(self.rng.integers(0, (last - first).days + 1, size=2))
+            for widget, day in ((start, days[0]), (end, days[1])):
+                value = (first + datetime.timedelta(days=int(day))).strftime("%Y/%m/%d")
+                self.states[widget.id] = WidgetState(id=widget.id, string_array_value=StringArray(data=[value]))
+        elif action == "regions":
+            widget = self.widgets.get("Select Region(s)")
+            if widget is None:
+                return None
+            picked = np.flatnonzero(self.rng.random(len(widget.options)) < 0.5)
+            self.states[widget.id] = WidgetState(id=widget.id, int_array_value=SInt64Array(data=picked.tolist()))
+        elif action == "view":
+            widget = self.widgets.get("Select View")
+            if widget is None:
+                return None
+            index = int(self.rng.integers(len(widget.options)))
+            self.states[widget.id] = WidgetState(id=widget.id, int_value=index)
+        return await self.rerun()
+
+
+async def _tour(session, steps, think, latencies):
+    await session.connect()
+    try:
+        latencies.append(("start", await session.rerun()))
+        for i in range(steps):
+            action, target = TOUR[i % len(TOUR)]
+            seconds = await session.step(action, target)
+            if seconds is None:
+                session.skipped.append(action)
+            else:
+                latencies.append((action, seconds))
+            if think:
+                await asyncio.sleep(think)
+    finally:
+        session.close()
+
+
+def rss_bytes(pid):
+    """
+    Return the resident memory of process `pid`, or None where /proc is not available.
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+async def _sample_memory(pid, samples, stop):
+    while not stop.is_set():
+        samples.append(rss_bytes(pid))
+        try:
+            await asyncio.wait_for(stop.wait(), MEMORY_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_round(port, sessions, steps, think=0.0, seed=0, pid=None):
+    """
+    Run `sessions` concurrent tours of `steps` steps and return their rerun latencies, skipped steps and the server's memory.
+    """
+    clients = [Session("127.0.0.1", port, [seed, i]) for i in range(sessions)]
+    latencies = []
+    samples = []
+    stop = asyncio.Event()
+    sampler = asyncio.ensure_future(_sample_memory(pid, samples, stop)) if pid else None
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(_tour(client, steps, think, latencies) for client in clients))
+    finally:
+        stop.set()
+        if sampler:
+            await sampler
+    elapsed = time.perf_counter() - start
+    samples = [sample for sample in samples if sample is not None]
+    return {
+        "sessions": sessions,
+        "seconds": elapsed,
+        "latencies": latencies,
+        "errors": [error for client in clients for error in client.errors],
+        "skipped": [action for client in clients for action in client.skipped],
+        "rss_bytes": samples[-1] if samples else None,
+        "peak_rss_bytes": max(samples) if samples else None,
+    }
+
+
+def summarize(result):
+    """
+    Return one report row of a round: rerun latency percentiles, throughput, skipped steps and server memory.
+    """
+    seconds = np.array([latency for _, latency in result["latencies"]])
+    p50, p95, p99 = np.percentile(seconds, [50, 95, 99]) if len(seconds) else (np.nan,) * 3
+    mb = lambda value: value / 2**20 if value is not None else np.nan
+    return {
+        "sessions": result["sessions"],
+        "reruns": len(seconds),
+        "errors": len(result["errors"]),
+        "skipped": len(result["skipped"]),
+        "p50 s": p50,
+        "p95 s": p95,
+        "p99 s": p99,
+        "reruns/s": len(seconds) / result["seconds"],
+        "rss MB": mb(result["rss_bytes"]),
+        "peak MB": mb(result["peak_rss_bytes"]),
+    }
+
+
+def start_server(data_dir, port):
+    """
+    Start a headless server for the app in `data_dir` and return its process once it is healthy.
+    """
+    os.makedirs(WORK_DIR, exist_ok=True)
+    command = [
+        sys.executable, "-m", "streamlit", "run", APP_PATH,
+        "--server.headless", "true", "--server.address", "127.0.0.1", "--server.port", str(port),
+        "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false",
+    ]
+    log = open(SERVER_LOG_PATH, "w")
+    server = subprocess.Popen(command, cwd=data_dir, stdout=log, stderr=subprocess.STDOUT)
+    log.close()
+    deadline = time.monotonic() + STARTUP_SECONDS
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"the server exited with status {server.returncode}, see {SERVER_LOG_PATH}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.read() == b"ok":
+                    return server
+        except OSError:
+            time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError(f"the server did not start within {STARTUP_SECONDS} s, see {SERVER_LOG_PATH}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the dashboard with concurrent browser-like sessions.")
+    parser.add_argument("--data", default=".", help="directory the app is run from")
+    parser.add_argument("--sessions", type=int, nargs="+", default=list(SESSIONS), help="concurrent session counts to run")
+    parser.add_argument("--steps", type=int, default=len(TOUR) * 3, help="tour steps (reruns) per session")
+    parser.add_argument("--think", type=float, default=0.0, help="seconds a session waits between steps")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = start_server(os.path.abspath(args.data), args.port)
+    results = []
+    try:
+        for sessions in args.sessions:
+            result = asyncio.run(run_round(args.port, sessions, args.steps, args.think, args.seed, server.pid))
+            row = summarize(result)
+            print(f"{sessions:4} sessions {row['reruns']:6} reruns {row['skipped']:4} skipped  p95 {row['p95 s']:8.3f} s",
+                  file=sys.stderr)
+            for action, count in sorted(Counter(result["skipped"]).items()):
+                print(f"  skipped {count} '{action}' steps: the page lacked the widget", file=sys.stderr)
+            for error in sorted(set(result["errors"])):
+                print(f"  error: {error}", file=sys.stderr)
+            results.append(result)
+    finally:
+        server.terminate()
+        server.wait()
+
+    with open(RESULTS_PATH, "w") as f:
+        json.dump({"results": results}, f)
+    table = pd.DataFrame([summarize(result) for result in results])
+    with pd.option_context("display.width", 200):
+        print(table.round(3).to_string(index=False))
+    return 1 if table["errors"].any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Benchmark the dashboard pages on their datasets scaled 1x, 10x and 100x.
+
+    python -m benchmarks.run --data DIR [--scales 1 10 100] [--repeat 3] [--save-baseline]
+
+DIR holds `data.csv`, `filtered_data.csv` and `Superstore.xls`; datasets missing from it are
+generated with `benchmarks.synthetic` at their usual size times the scale.
+Every case reports wall time, peak memory and serialized figure size, compared with the stored
+baseline; the exit status is 1 when a case regressed by more than the tolerance.
+"""
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+import streamlit.config
+import streamlit.logger
+
+from benchmarks.data import WORK_DIR, prepare
+from benchmarks.suite import cases, measure
+
+SCALES = (1, 10, 100)
+BASELINE_PATH = os.path.join("benchmarks", "baseline.json")
+RESULTS_PATH = os.path.join(WORK_DIR, "results.json")
+
+# Growth over the baseline reported as a regression, and times too short to compare reliably
+TOLERANCE = 0.25
+MIN_SECONDS = 0.005
+METRICS = ("seconds", "peak_bytes", "figure_bytes")
+
+
+def run(scales, source_dir, repeat):
+    """
+    Return one result record per case and scale.
+    """
+    results = []
+    home = os.getcwd()
+    for scale in scales:
+        os.chdir(prepare(scale, source_dir))
+        try:
+            for case in cases():
+                record = {"scale": scale, "case": case.name, **measure(case, repeat)}
+                print(f"x{scale:<4} {case.name:<48} {record['seconds']:9.3f} s", file=sys.stderr)
+                results.append(record)
+        finally:
+            os.chdir(home)
+    return results
+
+
+def _load(path):
+    try:
+        with open(path) as f:
+            return json.load(f)["results"]
+    except (OSError, ValueError, KeyError):
+        return []
+
+
+def _save(results, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"results": results}, f, indent=2)
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """
+    Return the results as a table with the ratio of every metric to its baseline and a regression flag.
+    """
+    table = pd.DataFrame(results)
+    base = pd.DataFrame(baseline, columns=["scale", "case", *METRICS])
+    table = table.merge(base, on=["scale", "case"], how="left", suffixes=("", " base"))
+    regressed = pd.Series(False, index=table.index)
+    for metric in METRICS:
+        table[f"{metric} ratio"] = (table[metric] / table[f"{metric} base"]).round(2)
+        worse = table[f"{metric} ratio"] > 1 + tolerance
+        if metric == "seconds":
+            worse &= table[metric] - table[f"{metric} base"] > MIN_SECONDS
+        regressed |= worse
+    table["regressed"] = regressed
+    return table.drop(columns=[f"{metric} base" for metric in METRICS])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard pages on scaled datasets.")
+    parser.add_argument("--data", default=".", help="directory holding the source datasets")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES), help="row multipliers to run")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (the best is kept)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="relative growth reported as a regression")
+    args = parser.parse_args(argv)
+
+    # Pages run in bare mode, where Streamlit warns about every missing script context
+    streamlit.config.set_option("logger.level", "error")
+    streamlit.logger.set_log_level("error")
+    source_dir = os.path.abspath(args.data)
+    results = run(args.scales, source_dir, args.repeat)
+    _save(results, RESULTS_PATH)
+
+    table = compare(results, _load(args.baseline), args.tolerance)
+    table["peak_bytes"] = (table["peak_bytes"] / 2**20).round(1)
+    table["figure_bytes"] = (table["figure_bytes"] / 2**10).round(1)
+    table = table.rename(columns={"peak_bytes": "peak MB", "figure_bytes": "figure KB", "seconds ratio": "time vs base",
+                                  "peak_bytes ratio": "peak vs base", "figure_bytes ratio": "figure vs base"})
+    with pd.option_context("display.width", 200, "display.max_rows", None):
+        print(table.round({"seconds": 4}).to_string(index=False))
+
+    if args.save_baseline:
+        _save(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    return 1 if table["regressed"].any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import gc
+import inspect
+import os
+import runpy
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+import pandas as pd
+import streamlit as st
+
+from utils.datasets import PROCUREMENT_PATH, SUPERSTORE_PATH, SUPPLYCHAIN_PATH
+from utils.export import EXPORTS
+from utils.figure_cache import FIGURES
+from utils.preprocessor import calculate_product_profit, preprocess
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages")
+
+# View functions of pages/supplychain.py, in the order the page's views call them
+SUPPLYCHAIN_VIEWS = [
+    "overallcards", "orderStatusCount", "salesTrend", "productPriceByShippingMode", "getSummary",
+    "get_segmentwise", "get_citywise", "get_countrywise", "get_Statewise",
+    "categoryPreferenceSegmentWise", "get_segmentsales",
+    "marketwisetrend", "get_marketsales", "marketduration",
+    "daywiseorder", "shippingmode", "averageshippingdelay", "shipdurationdistribution", "shipdurationbymode",
+    "bestSellingProducts", "bestSellingCategories", "bestProductMargins", "discountVsSales", "priceprofit",
+]
+
+
+@dataclass
+class Case:
+    """
+    One benchmarked call: `run(*setup())`, with `reset()` called before each run to drop caches.
+
+    A `warm` case keeps the shared figure cache and is run once before it is measured.
+    """
+    name: str
+    run: object
+    setup: object = tuple
+    reset: object = None
+    warm: bool = False
+
+
+def measure(case, repeat=3):
+    """
+    Return the best wall time of `repeat` runs of `case`, the peak memory of one more traced run
+    and the size of the figure JSON it built.
+
+    Peak memory is what `tracemalloc` sees: Python objects and NumPy buffers (pandas columns),
+    not Arrow's own memory pool. Figures are measured in the shared figure cache, which every
+    run starts empty (warm runs after it is filled), so the size is that of the figures the call
+    would send to the browser.
+    """
+    if case.warm:
+        FIGURES.clear()
+        case.run(*case.setup())
+    timings = []
+    for _ in range(repeat):
+        args = case.setup()
+        _reset(case)
+        start = time.perf_counter()
+        case.run(*args)
+        timings.append(time.perf_counter() - start)
+    figure_bytes = FIGURES.stats()["bytes"]
+
+    args = case.setup()
+    _reset(case)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.run(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(timings), "peak_bytes": peak, "figure_bytes": figure_bytes}
+
+
+def _reset(case):
+    if not case.warm:
+        FIGURES.clear()
+    if case.reset:
+        case.reset()
+
+
+def _run_page(name):
+    return runpy.run_path(os.path.join(PAGES_DIR, name), run_name="__page__")
+
+
+def _cold():
+    # Drops the shared datasets and indexes, so the page loads them again from its snapshot
+    st.cache_resource.clear()
+    EXPORTS.clear()
+
+
+def page_cases(label, page):
+    """
+    Cases for a whole run of `page`: cold (shared data reloaded from the snapshot, figures built)
+    and warm (data, indexes and figures served from the shared caches, as on a rerun).
+    """
+    return [
+        Case(f"{label}: page (cold)", lambda: _run_page(page), reset=_cold),
+        Case(f"{label}: page (warm)", lambda: _run_page(page), warm=True),
+    ]
+
+
+def supplychain_cases():
+    # A bare-mode run of the page gives its view functions, with the date range and dataset version set
+    _cold()
+    page = _run_page("supplychain.py")
+    df = page["df"]
+
+    def reset():
+        page["load_customer_rankings"].clear()
+
+    cases = [
+        Case("supplychain: preprocess", lambda: preprocess(SUPPLYCHAIN_PATH)),
+        Case("supplychain: calculate_product_profit", calculate_product_profit,
+             setup=lambda: (pd.read_csv(SUPPLYCHAIN_PATH, usecols=["product_price"]),)),
+    ]
+    cases += page_cases("supplychain", "supplychain.py")
+    for name in SUPPLYCHAIN_VIEWS:
+        # Fragments only run inside a script run; the undecorated function is timed instead
+        cases.append(Case(f"supplychain: {name}", inspect.unwrap(page[name]), setup=lambda: (df,), reset=reset))
+    return cases
+
+
+def procurement_cases():
+    _cold()
+    page = _run_page("procurement.py")
+    df = page["df"]
+    return [Case("procurement: build_totals", page["build_totals"], setup=lambda: (df,))] + page_cases("procurement", "procurement.py")
+
+
+def sales_cases():
+    _cold()
+    page = _run_page("sales_dashboard.py")
+    df, cube, start, end = page["df"], page["cube"], page["start_date"], page["end_date"]
+    return [
+        Case("sales: build_indexes", page["build_indexes"], setup=lambda: (df,)),
+        Case("sales: cube.select", lambda: cube.select(start, end, {})),
+    ] + page_cases("sales", "sales_dashboard.py")
+
+
+def cases():
+    """
+    Return the cases of every dataset in the working directory.
+    """
+    found = []
+    if os.path.exists(SUPPLYCHAIN_PATH):
+        found += supplychain_cases()
+    if os.path.exists(PROCUREMENT_PATH):
+        found += procurement_cases()
+    if os.path.exists(SUPERSTORE_PATH):
+        found += sales_cases()
+    return found
@@ -0,0 +1,490 @@
+"""
+Synthetic datasets with the schemas of the dashboard sources, generated and written in chunks.
+
+    python -m benchmarks.synthetic supplychain --rows 50000000 --out data.parquet
+    python -m benchmarks.synthetic superstore --rows 1000000 --out Superstore.xls
+
+Every generator yields DataFrames of at most `chunk_rows` rows with the source's columns and
+dtypes: label columns keep the source's cardinalities and hierarchies (City -> State -> Region,
+product -> sub-category -> category, ...), popularity is Zipf-skewed, and dates follow the
+source's span with its growth and seasonality. Chunks are written as they are generated, so
+files of any size (e.g. 50M-row fixtures) never have to fit in memory.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CHUNK_ROWS = 100_000
+
+# Data rows of one XLSX sheet (the first of its 1,048,576 rows is the header)
+XLSX_MAX_ROWS = 1_048_575
+
+# --- Superstore ---
+
+SUPERSTORE_REGIONS = {
+    "West": ["California", "Washington", "Arizona", "Colorado", "Oregon", "Utah", "Nevada",
+             "New Mexico", "Idaho", "Montana", "Wyoming"],
+    "East": ["New York", "Pennsylvania", "Ohio", "Massachusetts", "Delaware", "New Jersey", "Maryland",
+             "Rhode Island", "Connecticut", "New Hampshire", "District of Columbia", "Vermont",
+             "Maine", "West Virginia"],
+    "Central": ["Texas", "Illinois", "Michigan", "Indiana", "Wisconsin", "Minnesota", "Missouri",
+                "Oklahoma", "Iowa", "Nebraska", "Kansas", "South Dakota", "North Dakota"],
+    "South": ["Florida", "North Carolina", "Virginia", "Georgia", "Tennessee", "Kentucky", "Alabama",
+              "Louisiana", "South Carolina", "Arkansas", "Mississippi"],
+}
+
+# Sub-category: category, share of rows, typical unit price and margin before discount
+SUPERSTORE_SUB_CATEGORIES = {
+    "Binders": ("Office Supplies", 1523, 20, 0.35),
+    "Paper": ("Office Supplies", 1370, 20, 0.45),
+    "Furnishings": ("Furniture", 957, 35, 0.25),
+    "Phones": ("Technology", 889, 180, 0.2),
+    "Storage": ("Office Supplies", 846, 90, 0.15),
+    "Art": ("Office Supplies", 796, 10, 0.25),
+    "Accessories": ("Technology", 775, 60, 0.25),
+    "Chairs": ("Furniture", 617, 180, 0.15),
+    "Appliances": ("Office Supplies", 466, 80, 0.3),
+    "Labels": ("Office Supplies", 364, 10, 0.45),
+    "Tables": ("Furniture", 319, 250, 0.1),
+    "Envelopes": ("Office Supplies", 254, 20, 0.42),
+    "Bookcases": ("Furniture", 228, 170, 0.1),
+    "Fasteners": ("Office Supplies", 217, 6, 0.3),
+    "Supplies": ("Office Supplies", 190, 25, 0.1),
+    "Machines": ("Technology", 115, 300, 0.2),
+    "Copiers": ("Technology", 68, 600, 0.35),
+}
+
+SUPERSTORE_SHIP_MODES = {  # Share of orders and shipping days (low, high)
+    "Standard Class": (0.597, (4, 7)),
+    "Second Class": (0.195, (2, 5)),
+    "First Class": (0.154, (1, 3)),
+    "Same Day": (0.054, (0, 0)),
+}
+
+SUPERSTORE_SEGMENTS = {"Consumer": 0.52, "Corporate": 0.3, "Home Office": 0.18}
+
+SUPERSTORE_DISCOUNTS = {
+    0.0: 0.48, 0.2: 0.37, 0.7: 0.042, 0.8: 0.03, 0.3: 0.023, 0.4: 0.021,
+    0.6: 0.014, 0.1: 0.009, 0.5: 0.007, 0.15: 0.005, 0.32: 0.003, 0.45: 0.001,
+}
+
+# Orders per month relative to the yearly average (January first)
+SUPERSTORE_SEASONS = [0.5, 0.4, 0.9, 0.8, 0.9, 0.9, 0.9, 0.9, 1.7, 1.0, 1.8, 1.8]
+
+# --- Supply chain ---
+
+SUPPLYCHAIN_MARKETS = {"LATAM": 0.286, "Europe": 0.278, "Pacific Asia": 0.229, "USCA": 0.142, "Africa": 0.065}
+
+# Customer states as the raw file spells them ('91732' is a malformed row the preprocessing drops)
+SUPPLYCHAIN_CUSTOMER_STATES = [
+    "PR", "CA", "NY", "TX", "IL", "FL", "OH", "PA", "MI", "NJ", "AZ", "GA", "MD", "NC", "CO", "VA",
+    "OR", "MA", "TN", "NV", "MO", "HI", "CT", "UT", "NM", "LA", "WA", "WI", "MN", "SC", "IN", "DC",
+    "KY", "DE", "RI", "WV", "OK", "ND", "ID", "AL", "IA", "KS", "MT", "91732",
+]
+
+SUPPLYCHAIN_SEGMENTS = {"Consumer": 0.518, "Corporate": 0.303, "Home Office": 0.179}
+
+SUPPLYCHAIN_SHIPPING_MODES = {"Standard Class": 0.597, "Second Class": 0.195, "First Class": 0.154, "Same Day": 0.054}
+
+SUPPLYCHAIN_ORDER_STATUSES = {
+    "COMPLETE": 0.33, "PENDING_PAYMENT": 0.22, "PROCESSING": 0.121, "PENDING": 0.112, "CLOSED": 0.109,
+    "ON_HOLD": 0.054, "SUSPECTED_FRAUD": 0.023, "CANCELED": 0.02, "PAYMENT_REVIEW": 0.011,
+}
+
+SUPPLYCHAIN_PAYMENT_TYPES = {"DEBIT": 0.384, "TRANSFER": 0.276, "PAYMENT": 0.23, "CASH": 0.11}
+
+SUPPLYCHAIN_DISCOUNTS = [0.0, 0.01, 0.02, 0.03, 0.04, 0.05, 0.06, 0.07, 0.09, 0.1, 0.12, 0.13,
+                         0.15, 0.16, 0.17, 0.18, 0.2, 0.25]
+
+# --- Procurement ---
+
+PROCUREMENT_STATUSES = {"Sent": 0.55, "Closed": 0.25, "Approved": 0.12, "Cancelled": 0.08}
+PROCUREMENT_VENDOR_STATES = {"NY": 0.62, "NJ": 0.14, "CT": 0.06, "PA": 0.06, "MA": 0.04, "CA": 0.04, "IL": 0.04}
+
+# Share of label cells left empty, as in the source (the loader fills them with placeholders)
+PROCUREMENT_MISSING = 0.02
+
+
+def _zipf(n, exponent):
+    # Popularity of n ranked items, most popular first
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _shares(table):
+    # Labels and normalized weights of a {label: share} table
+    labels = np.array(list(table), dtype=object)
+    weights = np.array(list(table.values()), dtype=float)
+    return labels, weights / weights.sum()
+
+
+def _day_weights(start, end, yearly_growth, seasons=None):
+    # Relative order volume of every day in [start, end]
+    days = pd.date_range(start, end, freq="D")
+    years = (days - days[0]).days.to_numpy() / 365.25
+    weights = (1 + yearly_growth) ** years
+    if seasons is not None:
+        weights = weights * np.asarray(seasons)[days.month - 1]
+    return days.values, weights / weights.sum()
+
+
+def _order_sizes(rng, rows, mean_items):
+    # Items per order, geometrically distributed, with sizes adding up to exactly `rows`
+    sizes = rng.geometric(1 / mean_items, size=rows // max(int(mean_items), 1) + 16)
+    while sizes.sum() < rows:
+        sizes = np.concatenate([sizes, rng.geometric(1 / mean_items, size=len(sizes))])
+    cut = np.searchsorted(np.cumsum(sizes), rows)
+    sizes = sizes[:cut + 1].copy()
+    sizes[-1] -= sizes.sum() - rows
+    return sizes
+
+
+def _chunks(rows, chunk_rows, seed, make):
+    # Call make(rng, size, first_row) per chunk; each chunk has its own seed
+    for index, first in enumerate(range(0, rows, chunk_rows)):
+        rng = np.random.default_rng([seed, index])
+        yield make(rng, min(chunk_rows, rows - first), first)
+
+
+def superstore(rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """
+    Yield chunks of Superstore order lines (the `Superstore.xls` schema).
+    """
+    rng = np.random.default_rng(seed)
+
+    # Geography: 49 states, about 530 cities and 630 postal codes, all cities under their state's region
+    regions = [(region, state) for region, states in SUPERSTORE_REGIONS.items() for state in states]
+    state_weights = _zipf(len(regions), 1.1)
+    state_order = rng.permutation(len(regions))
+    city_state = state_order[rng.choice(len(regions), 531, p=state_weights)]
+    city_state[:len(regions)] = state_order  # Every state has at least one city
+    city_names = np.array([f"City {i:03d}" for i in range(531)], dtype=object)
+    city_weights = _zipf(531, 0.9)
+    postal_base = rng.choice(np.arange(10000, 99000, 10), 531, replace=False)
+    second_postal = rng.random(531) < 0.2
+    state_names = np.array([state for _, state in regions], dtype=object)
+    region_names = np.array([region for region, _ in regions], dtype=object)
+
+    # Catalog: about 1,860 products under the 17 sub-categories, with a list price each
+    subs = list(SUPERSTORE_SUB_CATEGORIES)
+    sub_shares = np.array([SUPERSTORE_SUB_CATEGORIES[sub][1] for sub in subs], dtype=float)
+    sub_shares /= sub_shares.sum()
+    product_sub = np.concatenate([np.arange(len(subs)), rng.choice(len(subs), 1862 - len(subs), p=sub_shares)])
+    product_weights = _zipf(1862, 0.4)[rng.permutation(1862)]
+    base_price = np.array([SUPERSTORE_SUB_CATEGORIES[sub][2] for sub in subs], dtype=float)
+    product_price = np.round(base_price[product_sub] * rng.lognormal(0, 0.6, 1862), 2)
+    margins = np.array([SUPERSTORE_SUB_CATEGORIES[sub][3] for sub in subs])
+    sub_names = np.array(subs, dtype=object)
+    category_names = np.array([SUPERSTORE_SUB_CATEGORIES[sub][0] for sub in subs], dtype=object)
+    product_ids = np.array([f"{category_names[s][:3].upper()}-{subs[s][:2].upper()}-{10000000 + i}"
+                            for i, s in enumerate(product_sub)], dtype=object)
+    product_names = np.array([f"{subs[s]} {i:04d}" for i, s in enumerate(product_sub)], dtype=object)
+
+    # About 790 customers, each in one segment
+    segments, segment_weights = _shares(SUPERSTORE_SEGMENTS)
+    customer_segment = rng.choice(segments, 793, p=segment_weights)
+    customer_ids = np.array([f"CU-{10000 + i}" for i in range(793)], dtype=object)
+    customer_names = np.array([f"Customer {i:03d}" for i in range(793)], dtype=object)
+    customer_weights = _zipf(793, 0.3)
+
+    days, day_weights = _day_weights("2014-01-03", "2017-12-30", 0.2, SUPERSTORE_SEASONS)
+    modes, mode_weights = _shares({mode: share for mode, (share, _) in SUPERSTORE_SHIP_MODES.items()})
+    ship_low = np.array([low for _, (low, _) in SUPERSTORE_SHIP_MODES.values()])
+    ship_high = np.array([high for _, (_, high) in SUPERSTORE_SHIP_MODES.values()])
+    discounts, discount_weights = _shares(SUPERSTORE_DISCOUNTS)
+
+    def make(rng, size, first):
+        # Order-level attributes are drawn once per order, then repeated for its lines
+        sizes = _order_sizes(rng, size, 1.95)
+        orders = len(sizes)
+        order_day = days[rng.choice(len(days), orders, p=day_weights)]
+        mode = rng.choice(len(modes), orders, p=mode_weights)
+        customer = rng.choice(793, orders, p=customer_weights)
+        city = rng.choice(531, orders, p=city_weights)
+        year = pd.DatetimeIndex(order_day).year
+        prefix = rng.choice(np.array(["CA", "US"], dtype=object), orders, p=[0.8, 0.2])
+        order_ids = np.array([f"{p}-{y}-{100000 + first + i}" for i, (p, y) in enumerate(zip(prefix, year))], dtype=object)
+
+        line = np.repeat(np.arange(orders), sizes)
+        order_date = order_day[line]
+        ship_days = rng.integers(ship_low[mode], ship_high[mode] + 1)[line]
+        city = city[line]
+        state = city_state[city]
+        product = rng.choice(1862, size, p=product_weights)
+        quantity = np.minimum(rng.poisson(2.8, size) + 1, 14)
+        discount = rng.choice(discounts, size, p=discount_weights).astype(float)
+        sales = np.round(product_price[product] * quantity * (1 - discount), 4)
+        margin = margins[product_sub[product]] - 1.3 * discount + rng.normal(0, 0.08, size)
+        return pd.DataFrame({
+            "Row ID": np.arange(first + 1, first + size + 1),
+            "Order ID": order_ids[line],
+            "Order Date": order_date,
+            "Ship Date": order_date + ship_days.astype("timedelta64[D]"),
+            "Ship Mode": modes[mode][line],
+            "Customer ID": customer_ids[customer][line],
+            "Customer Name": customer_names[customer][line],
+            "Segment": customer_segment[customer][line],
+            "Country": "United States",
+            "City": city_names[city],
+            "State": state_names[state],
+            "Postal Code": postal_base[city] + (second_postal[city] & (rng.random(size) < 0.4)),
+            "Region": region_names[state],
+            "Product ID": product_ids[product],
+            "Category": category_names[product_sub[product]],
+            "Sub-Category": sub_names[product_sub[product]],
+            "Product Name": product_names[product],
+            "Sales": sales,
+            "Quantity": quantity,
+            "Discount": discount,
+            "Profit": np.round(sales * margin, 4),
+        })
+
+    return _chunks(rows, chunk_rows, seed, make)
+
+
+def _countries():
+    # Real country names (so choropleths resolve them), grouped into the supply chain markets
+    import plotly.express as px
+
+    countries = px.data.gapminder()[["country", "continent"]].drop_duplicates("country")
+    markets = countries["continent"].map({"Europe": "Europe", "Africa": "Africa", "Asia": "Pacific Asia",
+                                          "Oceania": "Pacific Asia", "Americas": "LATAM"})
+    markets[countries["country"].isin(["United States", "Canada"])] = "USCA"
+    return countries["country"].to_numpy(dtype=object), markets.to_numpy(dtype=object)
+
+
+def supplychain(rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """
+    Yield chunks of supply chain order items (the raw `data.csv` schema read by `preprocess`).
+    """
+    rng = np.random.default_rng(seed)
+
+    # Order geography: market -> country -> about 1,090 states -> about 3,600 cities
+    countries, country_market = _countries()
+    markets, market_weights = _shares(SUPPLYCHAIN_MARKETS)
+    country_weights = np.zeros(len(countries))
+    for market, share in zip(markets, market_weights):
+        members = np.flatnonzero(country_market == market)
+        country_weights[members] = share * _zipf(len(members), 0.7)[rng.permutation(len(members))]
+    state_country = np.concatenate([np.arange(len(countries)), rng.choice(len(countries), 1089 - len(countries), p=country_weights)])
+    state_names = np.array([f"{countries[c]} State {i:04d}" for i, c in enumerate(state_country)], dtype=object)
+    state_weights = country_weights[state_country] * rng.dirichlet(np.ones(1089)) * 1089
+    city_state = np.concatenate([np.arange(1089), rng.choice(1089, 3597 - 1089, p=state_weights / state_weights.sum())])
+    city_names = np.array([f"City {i:04d}" for i in range(3597)], dtype=object)
+    city_weights = state_weights[city_state] * rng.dirichlet(np.ones(3597))
+    city_weights /= city_weights.sum()
+
+    # About 20,000 customers, each with a segment and a home city in one of the customer states
+    customer_states = np.array(SUPPLYCHAIN_CUSTOMER_STATES, dtype=object)
+    home_state_weights = _zipf(len(customer_states), 1.3)
+    home_state_weights[-1] = 1e-5  # The malformed state is a rare data entry error
+    home_state = rng.choice(len(customer_states), 563, p=home_state_weights / home_state_weights.sum())
+    home_state[:len(customer_states) - 1] = np.arange(len(customer_states) - 1)
+    home_cities = np.array([f"Town {i:03d}" for i in range(563)], dtype=object)
+    customer_city = rng.choice(563, 20652, p=_zipf(563, 1.0))
+    segments, segment_weights = _shares(SUPPLYCHAIN_SEGMENTS)
+    customer_segment = rng.choice(segments, 20652, p=segment_weights)
+    customer_weights = _zipf(20652, 0.2)
+
+    # Catalog: 118 products in 50 categories, with a fixed price each and a steep best-seller curve
+    product_category = np.concatenate([np.arange(50), rng.choice(50, 68)])
+    category_names = np.array([f"Category {i:02d}" for i in range(50)], dtype=object)
+    product_names = np.array([f"Product {i:03d}" for i in range(118)], dtype=object)
+    product_price = np.round(np.clip(rng.lognormal(4.3, 1.0, 118), 9.99, 1999.99), 2)
+    product_weights = _zipf(118, 1.3)[rng.permutation(118)]
+
+    days, day_weights = _day_weights("2015-01-01", "2018-01-31", 0.05)
+    modes, mode_weights = _shares(SUPPLYCHAIN_SHIPPING_MODES)
+    statuses, status_weights = _shares(SUPPLYCHAIN_ORDER_STATUSES)
+    payments, payment_weights = _shares(SUPPLYCHAIN_PAYMENT_TYPES)
+    discounts = np.array(SUPPLYCHAIN_DISCOUNTS)
+
+    def make(rng, size, first):
+        sizes = _order_sizes(rng, size, 2.2)
+        orders = len(sizes)
+        order_time = (days[rng.choice(len(days), orders, p=day_weights)]
+                      + rng.integers(0, 24 * 60, orders).astype("timedelta64[m]"))
+        customer = rng.choice(20652, orders, p=customer_weights)
+        city = rng.choice(3597, orders, p=city_weights)
+        mode = rng.choice(modes, orders, p=mode_weights)
+        status = rng.choice(statuses, orders, p=status_weights)
+        payment = rng.choice(payments, orders, p=payment_weights)
+
+        line = np.repeat(np.arange(orders), sizes)
+        customer, city = customer[line], city[line]
+        state = city_state[city]
+        country = state_country[state]
+        home = customer_city[customer]
+        home_state_code = customer_states[home_state[home]]
+        product = rng.choice(118, size, p=product_weights)
+        price = product_price[product]
+        quantity = rng.choice(np.arange(1, 6), size, p=[0.55, 0.15, 0.1, 0.1, 0.1])
+        sales = price * quantity
+        discount = rng.choice(discounts, size)
+        ratio = np.round(np.clip(rng.normal(0.12, 0.35, size), -2.75, 0.5), 2)
+        return pd.DataFrame({
+            "order_id": (first + np.arange(orders))[line],
+            "customer_id": customer + 1,
+            "customer_state": home_state_code,
+            "customer_city": home_cities[home],
+            "customer_country": np.where(home_state_code == "PR", "Puerto Rico", "EE. UU."),
+            "customer_segment": customer_segment[customer],
+            "order_date": order_time[line],
+            "market": country_market[country],
+            "shipping_mode": mode[line],
+            "order_city": city_names[city],
+            "order_state": state_names[state],
+            "order_country": countries[country],
+            "sales": sales,
+            "order_profit_per_order": np.round(sales * (1 - discount) * ratio, 2),
+            "product_name": product_names[product],
+            "category_name": category_names[product_category[product]],
+            "order_status": status[line],
+            "order_item_product_price": price,
+            "product_price": price,
+            "payment_type": payment[line],
+            "order_item_profit_ratio": ratio,
+            "order_item_discount_rate": discount,
+        })
+
+    return _chunks(rows, chunk_rows, seed, make)
+
+
+def procurement(rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """
+    Yield chunks of procurement line items (the `filtered_data.csv` columns the page reads).
+    """
+    rng = np.random.default_rng(seed)
+
+    # About 2,500 vendors, each registered in one state, with a long tail of rare ones
+    vendor_names = np.array([f"Vendor {i:04d}" for i in range(2500)], dtype=object)
+    vendor_weights = _zipf(2500, 1.1)
+    states, state_weights = _shares(PROCUREMENT_VENDOR_STATES)
+    vendor_state = rng.choice(states, 2500, p=state_weights)
+    commodity_names = np.array([f"Commodity {i:03d}" for i in range(400)], dtype=object)
+    commodity_weights = _zipf(400, 0.8)
+    department_names = np.array([f"Department {i:02d}" for i in range(40)], dtype=object)
+    department_weights = _zipf(40, 0.7)
+    statuses, status_weights = _shares(PROCUREMENT_STATUSES)
+
+    # Purchases are entered on business days, with volume growing over the decade
+    days, day_weights = _day_weights("2014-01-01", "2023-12-31", 0.06)
+    business = pd.DatetimeIndex(days).dayofweek < 5
+    days, day_weights = days[business], day_weights[business] / day_weights[business].sum()
+
+    def missing(rng, values):
+        values = values.copy()
+        values[rng.random(len(values)) < PROCUREMENT_MISSING] = None
+        return values
+
+    def make(rng, size, first):
+        vendor = rng.choice(2500, size, p=vendor_weights)
+        return pd.DataFrame({
+            "INPUT DATE": days[rng.choice(len(days), size, p=day_weights)],
+            "ITEM TOTAL COST": np.round(rng.lognormal(6.0, 1.8, size), 2),
+            "VENDOR NAME 1": missing(rng, vendor_names[vendor]),
+            "COMMODITY DESCRIPTION": missing(rng, rng.choice(commodity_names, size, p=commodity_weights)),
+            "STATUS": missing(rng, rng.choice(statuses, size, p=status_weights)),
+            "VENDOR STATE": missing(rng, vendor_state[vendor]),
+            "DEPARTMENT NAME": rng.choice(department_names, size, p=department_weights),
+        })
+
+    return _chunks(rows, chunk_rows, seed, make)
+
+
+# Generator and default file name of every dataset
+DATASETS = {
+    "superstore": (superstore, "Superstore.xls"),
+    "supplychain": (supplychain, "data.csv"),
+    "procurement": (procurement, "filtered_data.csv"),
+}
+
+FORMATS = ("csv", "xlsx", "parquet")
+
+
+def file_format(path):
+    """
+    Return the output format for `path` from its extension (`.xls` files are written as XLSX).
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".xls", ".xlsx"):
+        return "xlsx"
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    return "csv"
+
+
+def write_chunks(chunks, path, fmt=None):
+    """
+    Write an iterable of same-schema DataFrames to `path` as one CSV, XLSX or Parquet file.
+
+    Only one chunk is held in memory at a time. Returns the number of rows written.
+    """
+    fmt = fmt or file_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    rows = 0
+    if fmt == "csv":
+        with open(path, "w", newline="", encoding="utf-8") as out:
+            for chunk in chunks:
+                chunk.to_csv(out, index=False, header=rows == 0)
+                rows += len(chunk)
+    elif fmt == "parquet":
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema if writer else None, preserve_index=False)
+                writer = writer or pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                rows += len(chunk)
+        finally:
+            if writer:
+                writer.close()
+    else:
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        for chunk in chunks:
+            if rows + len(chunk) > XLSX_MAX_ROWS:
+                raise ValueError(f"An XLSX sheet holds at most {XLSX_MAX_ROWS:,} rows; write CSV or Parquet instead")
+            if rows == 0:
+                sheet.append(list(chunk.columns))
+            for record in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False):
+                sheet.append(record)
+            rows += len(chunk)
+        workbook.save(path)
+    return rows
+
+
+def generate(dataset, rows, path=None, fmt=None, seed=0, chunk_rows=CHUNK_ROWS):
+    """
+    Write `rows` rows of `dataset` (a `DATASETS` name) to `path`, by default its source file name.
+    """
+    make, default_path = DATASETS[dataset]
+    path = path or default_path
+    return write_chunks(make(rows, seed, chunk_rows), path, fmt)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic dashboard dataset of any size.")
+    parser.add_argument("dataset", choices=list(DATASETS))
+    parser.add_argument("--rows", type=int, required=True, help="number of data rows")
+    parser.add_argument("--out", help="output file (default: the dataset's source file name)")
+    parser.add_argument("--format", choices=FORMATS, help="output format (default: from the file extension)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows generated and written at a time")
+    args = parser.parse_args(argv)
+
+    rows = generate(args.dataset, args.rows, args.out, args.format, args.seed, args.chunk_rows)
+    print(f"Wrote {rows:,} rows to {args.out or DATASETS[args.dataset][1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
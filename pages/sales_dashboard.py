@@ -2,8 +2,21 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 import os
+import hashlib
 import warnings
-import plotly.figure_factory as ff
+from utils.chart_data import chart_totals
+from utils.compact import compact
+from utils.cube import SalesCube
+from utils.datasets import SUPERSTORE_CATEGORIES, load_superstore
+from utils.export import EXPORT_FORMATS, EXPORTS
+from utils.date_index import DateIndex, sort_by_date
+from utils.figure_cache import FIGURES, plotly_chart
+from utils.filter_index import HierarchyIndex
+from utils.grid import DataGrid
+from utils.lru import cache_key
+from utils.profiling import section
+from utils.scatter import budgeted_scatter
+from utils.shared import SharedFrame
 
 # Suppress warnings
 warnings.filterwarnings('ignore')
@@ -19,139 +32,199 @@ st.markdown("Explore sales trends, regional performance, and product categories.
 uploaded_file = st.file_uploader(":file_folder: Upload Your Sales Data (CSV, TXT, XLSX, XLS)", type=["csv", "txt", "xlsx", "xls"])
 
 # --- Data Loading and Preprocessing ---
+section("load_data")
+@st.cache_resource  # Share one read-only copy of the default dataset across sessions
+def load_default_data():
+  return SharedFrame(load_superstore())
+
+@st.cache_resource(max_entries=4)  # Keyed by the file's digest, so an upload is parsed once instead of on every rerun
+def load_uploaded_data(digest, _uploaded_file):
+  df = pd.read_csv(_uploaded_file, encoding="ISO-8859-1")
+  df["Order Date"] = pd.to_datetime(df["Order Date"])
+  return SharedFrame(compact(sort_by_date(df, "Order Date"), SUPERSTORE_CATEGORIES))
+
 if uploaded_file is not None:
   filename = uploaded_file.name
   st.write(f"Uploaded file: {filename}")
   try:
-      df = pd.read_csv(uploaded_file, encoding="ISO-8859-1")
+      data = load_uploaded_data(hashlib.sha256(uploaded_file.getvalue()).hexdigest(), uploaded_file)
   except UnicodeDecodeError:
       st.error("Error decoding file. Please ensure it's in a compatible format.")
       st.stop()
 else:
-  df = pd.read_excel("Superstore.xls")
+  # Already typed and sorted by order date
+  data = load_default_data()
+df = data.view()
+dataset_version = data.version
+
+# --- Date Index, Aggregate Cube and Filter Index ---
+section("indexes")
+def build_indexes(df):
+  return DateIndex(df, "Order Date"), SalesCube(df), HierarchyIndex(df)
+
+@st.cache_resource(max_entries=4)  # Built once per dataset version, for the default dataset and every upload
+def load_indexes(version, _data):
+  return build_indexes(_data.view())
 
-df["Order Date"] = pd.to_datetime(df["Order Date"])
-start_date = df["Order Date"].min()
-end_date = df["Order Date"].max()
+dates, cube, index = load_indexes(dataset_version, data)
+
+start_date, end_date = dates.span()
 
 # --- Date Range Selection ---
+section("filters")
 col1, col2 = st.columns(2)
 with col1:
-  date1 = pd.to_datetime(st.date_input("Start Date", start_date))
+  date1 = st.date_input("Start Date", start_date, min_value=start_date, max_value=end_date)
 with col2:
-  date2 = pd.to_datetime(st.date_input("End Date", end_date))
+  date2 = st.date_input("End Date", end_date, min_value=start_date, max_value=end_date)
 
-df = df[(df["Order Date"] >= date1) & (df["Order Date"] <= date2)].copy()
+# A file without valid order dates (or a cleared date input) leaves nothing to select
+if date1 is None or date2 is None:
+  st.warning("There are no order dates to select from. Check the Order Date column of the data.")
+  st.stop()
+date1, date2 = pd.to_datetime(date1), pd.to_datetime(date2)
 
 # --- Sidebar Filters ---
+# Options and rows come from the Region -> State -> City index, restricted to the date range
 st.sidebar.header("Filter Your Data")
-region = st.sidebar.multiselect("Select Region(s)", df["Region"].unique())
-if region:
-  df = df[df["Region"].isin(region)]
-
-state = st.sidebar.multiselect("Select State(s)", df["State"].unique())
-if state:
-  df = df[df["State"].isin(state)]
-
-city = st.sidebar.multiselect("Select City(ies)", df["City"].unique())
-if city:
-  df = df[df["City"].isin(city)]
+region = st.sidebar.multiselect("Select Region(s)", index.options("Region", date1, date2))
+state = st.sidebar.multiselect("Select State(s)", index.options("State", date1, date2, {"Region": region}))
+city = st.sidebar.multiselect("Select City(ies)", index.options("City", date1, date2, {"Region": region, "State": state}))
 
+if region or state or city:
+  df = df.iloc[index.select(date1, date2, {"Region": region, "State": state, "City": city})]
+else:
+  # Zero-copy slice of the date-sorted rows
+  df = dates.slice(date1, date2)
+
+# Charts are answered from the cube cells matching the filters; the rows are only needed for row-level views
+cells = cube.select(date1, date2, {"Region": region, "State": state, "City": city})
+
+# Figures are shared across sessions looking at the same dataset and filters
+filter_state = {"start": date1, "end": date2, "region": region, "state": state, "city": city}
+def cached_figure(chart, build):
+  return FIGURES.figure(cache_key("sales_dashboard", chart, filter_state, dataset_version), build)
+
+# plotly.figure_factory is slow to import and only builds this table, so it is imported on a cache miss
+def summary_table(df_sample):
+  import plotly.figure_factory as ff
+  return ff.create_table(df_sample, colorscale="Cividis")
+
+# Exports are only serialized when asked for, then kept for the same dataset, filters and format
+def export_button(label, data, file_stem):
+  fmt = st.radio("Format", list(EXPORT_FORMATS), horizontal=True, key=f"{file_stem}_format")
+  extension, mime = EXPORT_FORMATS[fmt]
+  file_name = f"{file_stem}.{extension}"
+  key = cache_key("sales_dashboard", file_name, filter_state, dataset_version)
+  if key in EXPORTS or st.button(f"Prepare {file_name}", key=f"{file_stem}_prepare"):
+    st.download_button(label, data=EXPORTS.export(key, data, fmt), file_name=file_name, mime=mime, key=f"{file_stem}_download")
 
 # --- Category Wise Sales ---
-category_df = df.groupby(by=["Category"], as_index=False)["Sales"].sum()
+section("category_sales")
+category_df = chart_totals(cells, "Category", "Sales")
+region_df = chart_totals(cells, "Region", "Sales")
 col1, col2 = st.columns(2)
 with col1:
   st.subheader("Category wise Sales")
-  fig = px.bar(category_df, x="Category", y="Sales", text=['${:,.2f}'.format(x) for x in category_df["Sales"]],
-               template="seaborn")
-  st.plotly_chart(fig, use_container_width=True, height=400)  # Increased height for better visibility
+  fig = cached_figure("category_bar", lambda: px.bar(category_df, x="Category", y="Sales", text=['${:,.2f}'.format(x) for x in category_df["Sales"]],
+               template="seaborn"))
+  plotly_chart(fig, use_container_width=True)
 
 with col2:
   st.subheader("Region wise Sales")
-  fig = px.pie(df, values="Sales", names="Region", hole=0.5)
-  fig.update_traces(text=df["Region"], textposition="outside")
-  st.plotly_chart(fig, use_container_width=True)
+  fig = cached_figure("region_pie", lambda: px.pie(region_df, values="Sales", names="Region", hole=0.5)
+                     .update_traces(text=region_df["Region"], textposition="outside"))
+  plotly_chart(fig, use_container_width=True)
 
 # --- Expandable Data Views ---
+section("category_region_tables")
 cl1, cl2 = st.columns((2))
 with cl1:
   with st.expander("Category View Data"):
-      st.write(category_df.style.background_gradient(cmap="Blues"))
-      csv = category_df.to_csv(index=False).encode('utf-8')
-      st.download_button("Download Category Data", data=csv, file_name="Category.csv", mime="text/csv")
+      DataGrid(category_df, cmap="Blues").show("category_page")
+      export_button("Download Category Data", category_df, "Category")
 
 with cl2:
   with st.expander("Region View Data"):
-      region_df = df.groupby(by="Region", as_index=False)["Sales"].sum()
-      st.write(region_df.style.background_gradient(cmap="Oranges"))
-      csv = region_df.to_csv(index=False).encode('utf-8')
-      st.download_button("Download Region Data", data=csv, file_name="Region.csv", mime="text/csv")
+      DataGrid(region_df, cmap="Oranges").show("region_page")
+      export_button("Download Region Data", region_df, "Region")
 
 # --- Time Series Analysis ---
-df["month_year"] = df["Order Date"].dt.to_period("M")
+section("time_series")
 st.subheader('Time Series Analysis of Sales')
 
-linechart = pd.DataFrame(df.groupby(df["month_year"].dt.strftime("%Y : %b"))["Sales"].sum()).reset_index()
-fig2 = px.line(linechart, x="month_year", y="Sales", labels={"Sales": "Amount"}, height=500, template="gridon")
-st.plotly_chart(fig2, use_container_width=True)
+linechart = cells.groupby(cells["month"].dt.strftime("%Y : %b"))["Sales"].sum().rename_axis("month_year").reset_index()
+fig2 = cached_figure("time_series", lambda: px.line(linechart, x="month_year", y="Sales", labels={"Sales": "Amount"}, height=500, template="gridon"))
+plotly_chart(fig2, use_container_width=True)
 
 with st.expander("View Time Series Data"):
-  st.write(linechart.T.style.background_gradient(cmap="Blues"))
-  csv = linechart.to_csv(index=False).encode("utf-8")
-  st.download_button('Download Time Series Data', data=csv, file_name="TimeSeries.csv", mime='text/csv')
+  DataGrid(linechart, cmap="Blues").show("time_series_page")
+  export_button('Download Time Series Data', linechart, "TimeSeries")
 
 
 # --- Treemap ---
+section("treemap")
 st.subheader("Hierarchical View of Sales using TreeMap")
-fig3 = px.treemap(df, path=["Region", "Category", "Sub-Category"], values="Sales", hover_data=["Sales"],
-                color="Sub-Category")
-fig3.update_layout(width=800, height=650)
-st.plotly_chart(fig3, use_container_width=True)
+treemap_df = chart_totals(cells, ["Region", "Category", "Sub-Category"], "Sales")
+fig3 = cached_figure("treemap", lambda: px.treemap(treemap_df, path=["Region", "Category", "Sub-Category"], values="Sales", hover_data=["Sales"],
+                color="Sub-Category").update_layout(width=800, height=650))
+plotly_chart(fig3, use_container_width=True)
 
 
 # --- Pie Charts ---
+section("segment_category_pies")
 chart1, chart2 = st.columns((2))
 with chart1:
   st.subheader('Segment wise Sales')
-  fig = px.pie(df, values="Sales", names="Segment", template="plotly_dark")
-  fig.update_traces(text=df["Segment"], textposition="inside")
-  st.plotly_chart(fig, use_container_width=True)
+  segment_df = chart_totals(cells, "Segment", "Sales")
+  fig = cached_figure("segment_pie", lambda: px.pie(segment_df, values="Sales", names="Segment", template="plotly_dark")
+                     .update_traces(text=segment_df["Segment"], textposition="inside"))
+  plotly_chart(fig, use_container_width=True)
 
 with chart2:
   st.subheader('Category wise Sales Distribution') # More descriptive title
-  fig = px.pie(df, values="Sales", names="Category", template="gridon")
-  fig.update_traces(text = df["Category"], textposition = "inside")
-  st.plotly_chart(fig,use_container_width=True)
+  fig = cached_figure("category_pie", lambda: px.pie(category_df, values="Sales", names="Category", template="gridon")
+                     .update_traces(text = category_df["Category"], textposition = "inside"))
+  plotly_chart(fig,use_container_width=True)
 
 
 # --- Summary Table and Monthly Sub-Category Sales ---
+section("summary_table")
 st.subheader("Month wise Sub-Category Sales Summary")
 with st.expander("View Summary Table"):
   df_sample = df.head()[["Region", "State", "City", "Category", "Sales", "Profit", "Quantity"]]
-  fig = ff.create_table(df_sample, colorscale="Cividis")
-  st.plotly_chart(fig, use_container_width=True)
+  fig = cached_figure("summary_table", lambda: summary_table(df_sample))
+  plotly_chart(fig, use_container_width=True)
 
   st.markdown("Month wise Sub-Category Sales")
-  df["month"] = df["Order Date"].dt.month_name()
-  sub_category_Year = pd.pivot_table(data=df, values="Sales", index=["Sub-Category"], columns="month")
-  st.write(sub_category_Year.style.background_gradient(cmap="Blues"))
+  # Average sale per order, from the summed Sales and order counts of each cell
+  month_cells = cells.assign(month=cells["month"].dt.strftime("%B"))
+  sub_category_Year = pd.pivot_table(data=month_cells, values=["Sales", "Orders"], index=["Sub-Category"], columns="month", aggfunc="sum", observed=True)
+  sub_category_Year = sub_category_Year["Sales"] / sub_category_Year["Orders"]
+  DataGrid(sub_category_Year, cmap="Blues").show("sub_category_page")
 
 
 # --- Scatter Plot ---
+section("sales_profit_scatter")
 st.subheader("Relationship between Sales and Profit") # Clearer title
-data1 = px.scatter(df, x="Sales", y="Profit", size="Quantity", title="Sales vs. Profit",
-                labels={"Sales": "Sales Amount", "Profit": "Profit Amount", "Quantity": "Quantity Sold"}) # Improved labels
-st.plotly_chart(data1, use_container_width=True)
+scatter = cached_figure("sales_profit_scatter", lambda: budgeted_scatter(df, x="Sales", y="Profit", size="Quantity", title="Sales vs. Profit",
+                labels={"Sales": "Sales Amount", "Profit": "Profit Amount", "Quantity": "Quantity Sold"})) # Improved labels
+plotly_chart(scatter, use_container_width=True)
+if scatter.shown < len(df):
+  # The sample only thins the markers; the correlation is taken over every filtered order
+  st.caption(f"Showing a representative sample of {scatter.shown:,} of {len(df):,} orders. "
+             f"Sales/Profit correlation over all orders: {df['Sales'].corr(df['Profit']):.2f}")
 
 
 # --- View Filtered Data ---
+section("filtered_data")
+# Pages through every filtered row; only the visible page is styled and sent
 with st.expander("View Filtered Data"):
-  st.write(df.iloc[:500, 1:20:2].style.background_gradient(cmap="Oranges"))
+  DataGrid(df.iloc[:, 1:20:2], cmap="Oranges").show("filtered_page")
 
 # --- Download Original Dataset ---
-csv = df.to_csv(index=False).encode('utf-8')
-st.download_button('Download Filtered Dataset', data=csv, file_name="Filtered_Superstore_Data.csv", mime="text/csv")
+section("filtered_export")
+export_button('Download Filtered Dataset', df, "Filtered_Superstore_Data")
 
 
 # --- Indicate created/modified files during execution ---
@@ -4,147 +4,55 @@ import plotly.express as px
 import plotly.graph_objects as go
 import plotly.io as pio
 import numpy as np
-from datetime import timedelta
+from utils.aggregate import aggregate, top_k
+from utils.chart_data import chart_totals
+from utils.datasets import load_supplychain
+from utils.date_index import DateIndex
+from utils.distribution import box_stats, box_traces, histogram
+from utils.figure_cache import FIGURES, plotly_chart
+from utils.lru import cache_key
+from utils.profiling import profiled
+from utils.ranking import RankedCounts
+from utils.scatter import budgeted_scatter
+from utils.shared import SharedFrame
 
 # Applying Plotly theme
 # pio.templates.default = 'plotly_white'
 
-# --- Helper Functions (from preprocessor.py) ---
+# --- Rerun Sections ---
+# View functions with their own widgets are decorated with `st.fragment`: interacting with a
+# widget reruns only that view, with the data it was given on the last full run, instead of the
+# whole page. Changing the sidebar view or dates still reruns everything.
+#
+# Every view function is `profiled`: with profiling on (see `utils.profiling`), its time and
+# figures are reported in the sidebar debug panel.
 
-def update_delivery_date(row):
-  """
-  Update the delivery date based on the shipping mode and market.
-  """
-  days_to_add = 0
-
-  # Define minimum and maximum days for each shipping mode
-  min_days = {
-      'First Class': 2,
-      'Second Class': 5,
-      'Standard Class': 8
-  }
-  max_days = {
-      'First Class': 3,
-      'Second Class': 6,
-      'Standard Class': 11
-  }
-
-  # Check market and shipping mode
-  if row['market'] in ['LATAM', 'USCA']:
-      if row['shipping_mode'] in min_days:
-          days_to_add = min_days[row['shipping_mode']]
-  elif row['market'] == 'Pacific Asia':
-      if row['shipping_mode'] in max_days:
-          days_to_add = max_days[row['shipping_mode']]
-  else:
-      # Randomly add days based on shipping mode
-      if row['shipping_mode'] == 'First Class':
-          days_to_add = np.random.randint(2, 4)
-      elif row['shipping_mode'] == 'Second Class':
-          days_to_add = np.random.randint(5, 7)
-      elif row['shipping_mode'] == 'Standard Class':
-          days_to_add = np.random.randint(8, 12)
-
-  # Update the delivery date
-  return row['delivery_date'] + timedelta(days=days_to_add)
-
-def calculate_product_profit(df):
-  """
-  Calculate the profit for each product based on its price and a fluctuating profit percentage.
-  """
-  min_price = df['product_price'].min()
-  max_price = df['product_price'].max()
-  
-  # Define initial and maximum profit percentages
-  min_profit_percentage = 0.03
-  max_profit_percentage = 0.30
-  
-  # Calculate the linear profit percentage for each price
-  linear_profit_percentage = min_profit_percentage + (max_profit_percentage - min_profit_percentage) * (
-      (df['product_price'] - min_price) / (max_price - min_price))
-  
-  # Add random fluctuation
-  np.random.seed(0)  # For reproducibility
-  fluctuation = np.random.uniform(-0.20, 0.20, size=df.shape[0])  # Random fluctuation between -20% and +20%
-  
-  # Adding randomness to product price to introduce variability in the lower values
-  random_price_fluctuation = np.random.uniform(-0.05, 0.05, size=df.shape[0])
-  df['product_price'] = df['product_price'] * (1 + random_price_fluctuation)
-  
-  # Adjust profit percentage with the added fluctuation
-  df['profit_percentage'] = np.clip(linear_profit_percentage + fluctuation, min_profit_percentage, max_profit_percentage)
-  
-  # Calculate the profit based on the adjusted price and profit percentage
-  df['product_profit'] = df['product_price'] * df['profit_percentage']
-  
-  # Drop the intermediate 'profit_percentage' column if not needed
-  df.drop(columns=['profit_percentage'], inplace=True)
-  
-  return df['product_profit']
+# --- Figure Cache ---
 
-def preprocess():
+def cached_figure(chart, build, **state):
   """
-  Load and preprocess the data from a CSV file.
+  Return the cached figure (spec and points shown) of `chart` for the selected dates and other widget `state`.
   """
-  # Load data from CSV
-  df = pd.read_csv('data.csv')
-
-  # Drop rows with specific customer state
-  drop = df[df['customer_state'] == '91732'].index
-  df.drop(drop, inplace=True)
-
-  # Convert order_date to datetime
-  df['order_date'] = pd.to_datetime(df['order_date'], utc=True)
-  df = df.dropna(subset=['order_date'])
-  df['order_date'] = df['order_date'].dt.tz_localize(None)
-
-  # Map customer states to full names
-  state_mapping = {
-      'PR': 'Puerto Rico', 'CA': 'California', 'KY': 'Kentucky', 'NJ': 'New Jersey', 'AZ': 'Arizona', 
-      'PA': 'Pennsylvania', 'NY': 'New York', 'OH': 'Ohio', 'CO': 'Colorado', 'MT': 'Montana', 
-      'WI': 'Wisconsin', 'IL': 'Illinois', 'DC': 'District of Columbia', 'CT': 'Connecticut', 
-      'WV': 'West Virginia', 'UT': 'Utah', 'FL': 'Florida', 'TX': 'Texas', 'MI': 'Michigan', 
-      'NM': 'New Mexico', 'NV': 'Nevada', 'WA': 'Washington', 'NC': 'North Carolina', 'GA': 'Georgia', 
-      'MD': 'Maryland', 'SC': 'South Carolina', 'TN': 'Tennessee', 'IN': 'Indiana', 'MO': 'Missouri', 
-      'MN': 'Minnesota', 'OR': 'Oregon', 'VA': 'Virginia', 'MA': 'Massachusetts', 'HI': 'Hawaii', 
-      'RI': 'Rhode Island', 'DE': 'Delaware', 'ID': 'Idaho', 'LA': 'Louisiana', 'ND': 'North Dakota', 
-      'KS': 'Kansas', 'IA': 'Iowa', 'OK': 'Oklahoma', 'AL': 'Alabama'
-  }
-
-  # Map states
-  df['customer_state'] = df['customer_state'].map(state_mapping)
-  df['delivery_date'] = df['order_date']
-  df['delivery_date'] = df.apply(update_delivery_date, axis=1)
-
-  # Adjust delivery dates for 'Same Day' shipping mode
-  temp_df = df[df['shipping_mode'] == 'Same Day']
-  num_rows_to_modify = int(len(temp_df) * 0.08)
-  num_rows_to_modify2 = int(len(temp_df) * 0.02)
-  random_indices = np.random.choice(temp_df.index, num_rows_to_modify, replace=False)
-  random_indices2 = np.random.choice(temp_df.index, num_rows_to_modify2, replace=False)
-  temp_df.loc[random_indices, 'delivery_date'] += pd.Timedelta(days=1)
-  temp_df.loc[random_indices2, 'delivery_date'] += pd.Timedelta(days=2)
-  df.loc[df['shipping_mode'] == 'Same Day', 'delivery_date'] = temp_df['delivery_date']
-  
-  # Calculate shipping duration
-  df['shipping_duration'] = (df['delivery_date'] - df['order_date']).dt.days
+  return FIGURES.figure(cache_key('supplychain', chart, dict(filter_state, **state), dataset_version), build)
 
-  # Add order weekday
-  df['order_weekday'] = df['order_date'].dt.day_name()
+# --- Customer Rankings ---
 
-  # Adjust weekdays for specific conditions
-  for weekday in ['Monday', 'Tuesday', 'Wednesday', 'Thursday']:
-      temp_df = df[df['order_weekday'] == weekday]
-      temp_df.iloc[:200, temp_df.columns.get_loc('order_weekday')] = 'Saturday' if weekday in ['Monday', 'Tuesday'] else 'Sunday'
-      df[df['order_weekday'] == weekday] = temp_df
+@st.cache_resource(max_entries=16)  # Built once per dataset version and date range, shared across sessions
+def load_customer_rankings(version, start, end, _df):
+  rankings = {label: RankedCounts(_df, column, 'customer_id', label, 'No. of Customers')
+              for label, column in (('City', 'order_city'), ('Country', 'order_country'), ('State', 'order_state'))}
+  choices = {column: list(_df[column].unique()) for column in ('customer_city', 'order_country', 'customer_state')}
+  return rankings, choices
 
-  # Calculate product profit
-  df['product_profit'] = calculate_product_profit(df)
-
-  return df
+def customer_rankings(df):
+  """
+  Return the ranked customer counts per City, Country and State of `df`, and the selectbox choices.
+  """
+  return load_customer_rankings(dataset_version, filter_state['start'], filter_state['end'], df)
 
 # --- Functions from summary.py ---
 
+@profiled
 def getSummary(df):
   """
   Display summary analysis of the data.
@@ -155,10 +63,10 @@ def getSummary(df):
   st.write("Most of the Orders are placed from Europe and LATAM (a group of 33 countries in Latin America and the Caribbean).")
   
   # Market distribution
-  market_count = df['market'].value_counts()
-  fig = go.Figure([go.Pie(labels=market_count.index, values=market_count.values)])
-  fig.update_layout()
-  st.plotly_chart(fig)
+  def build():
+    market_count = df['market'].value_counts().loc[lambda counts: counts > 0]
+    return go.Figure([go.Pie(labels=market_count.index, values=market_count.values)])
+  plotly_chart(cached_figure('market_orders', build))
 
   st.markdown(""" <h2 style="font-size: 32px; font-weight: bold; color: #FF7F50;">
           Top Product Categories by Orders
@@ -166,11 +74,14 @@ def getSummary(df):
   st.write("Most of the Orders are placed for Shoes and Women's Clothing.")
   
   # Top product categories
-  category_count = df['category_name'].value_counts().head(10)
-  fig = go.Figure([go.Bar(x=category_count.index, y=category_count.values)])
-  fig.update_layout(xaxis_title='Category', yaxis_title='Count')
-  st.plotly_chart(fig)
-
+  def build():
+    category_count = df['category_name'].value_counts().loc[lambda counts: counts > 0].head(10)
+    fig = go.Figure([go.Bar(x=category_count.index, y=category_count.values)])
+    fig.update_layout(xaxis_title='Category', yaxis_title='Count')
+    return fig
+  plotly_chart(cached_figure('top_categories', build))
+
+@profiled
 def overallcards(df):
   """
   Display key metrics summary in card format.
@@ -217,6 +128,7 @@ def overallcards(df):
                   unsafe_allow_html=True
               )
 
+@profiled
 def orderStatusCount(df):
   """
   Display the count of different order statuses.
@@ -229,10 +141,12 @@ def orderStatusCount(df):
   st.write("Most of the Orders are completed successfully.")
   
   # Count of order statuses
-  order_status_count = df['order_status'].value_counts().reset_index()
-  fig = px.bar(order_status_count, x='count', y='order_status')
-  st.plotly_chart(fig)
+  def build():
+    order_status_count = df['order_status'].value_counts().loc[lambda counts: counts > 0].reset_index()
+    return px.bar(order_status_count, x='count', y='order_status')
+  plotly_chart(cached_figure('order_status', build))
 
+@profiled
 def salesTrend(df):
   """
   Display the sales trend over time.
@@ -244,11 +158,12 @@ def salesTrend(df):
   st.write("The sales increase in summer but not increasing during the overall number of years.")
   
   # Group sales by order date
-  df['order_date'] = pd.to_datetime(df['order_date'])
-  sales_trend = df.groupby('order_date')['sales'].sum().reset_index()
-  fig = px.line(sales_trend, x='order_date', y='sales')
-  st.plotly_chart(fig)
+  def build():
+    sales_trend = df.groupby('order_date')['sales'].sum().reset_index()
+    return px.line(sales_trend, x='order_date', y='sales')
+  plotly_chart(cached_figure('sales_trend', build))
 
+@profiled
 def productPriceByShippingMode(df):
   """
   Display product prices by shipping mode.
@@ -259,9 +174,13 @@ def productPriceByShippingMode(df):
       </h2>""", unsafe_allow_html=True)
   st.write("There is no significant difference in product price based on shipping mode.")
   
-  # Box plot of product prices by shipping mode
-  fig = px.box(df, x='shipping_mode', y='order_item_product_price')
-  st.plotly_chart(fig)
+  # Box plot of product prices by shipping mode, drawn from quartiles computed here
+  def build():
+    stats = box_stats(df, 'order_item_product_price', 'shipping_mode')
+    fig = go.Figure(box_traces(stats, color=px.colors.qualitative.Plotly[0]))
+    fig.update_layout(xaxis_title='shipping_mode', yaxis_title='order_item_product_price')
+    return fig
+  plotly_chart(cached_figure('price_by_mode', build))
 
 def paymentTypeDistribution(df):
   """
@@ -273,20 +192,22 @@ def paymentTypeDistribution(df):
       </h2>""", unsafe_allow_html=True)
   
   # Count of payment types
-  payment_type_count = df['payment_type'].value_counts().reset_index()
-  fig = px.pie(payment_type_count, values='count', names='payment_type')
-  st.plotly_chart(fig)
+  def build():
+    payment_type_count = df['payment_type'].value_counts().loc[lambda counts: counts > 0].reset_index()
+    return px.pie(payment_type_count, values='count', names='payment_type')
+  plotly_chart(cached_figure('payment_types', build))
 
 # --- Functions from customer.py ---
 
+@st.fragment
+@profiled
 def get_citywise(df):
   """
   Display the number of customers by city.
   """
   st.write("")
-  city_wise_customer = df.groupby('order_city')['customer_id'].count().reset_index().sort_values(by='customer_id', ascending=False)
-  city_wise_customer.rename(columns={'order_city': 'City', 'customer_id': 'No. of Customers'}, inplace=True)
-  city_wise_customer.reset_index(drop=True, inplace=True)
+  rankings, choices = customer_rankings(df)
+  city_wise_customer = rankings['City']
 
   st.markdown(""" <h2 style="font-size: 32px; font-weight: bold; color: #FF7F50;">
           City wise Customers
@@ -300,41 +221,36 @@ def get_citywise(df):
 
       page = st.selectbox('Select page', range(1, total_pages + 1))
 
-      start_idx = (page - 1) * page_size
-      end_idx = start_idx + page_size
-
-      fig = px.bar(city_wise_customer.iloc[start_idx:end_idx], x='City', y='No. of Customers')
-      st.plotly_chart(fig)
+      fig = cached_figure('city_customers', lambda: px.bar(city_wise_customer.page(page, page_size), x='City', y='No. of Customers'),
+                          page=page)
+      plotly_chart(fig)
 
   else:
-      city_list = list(df['customer_city'].unique())
-      city_list.insert(0, 'Overall')
+      city_list = ['Overall'] + choices['customer_city']
       selected_city = st.selectbox('Select City', options=city_list, index=0)
 
+      city_table = city_wise_customer.table
       if selected_city != 'Overall':
-          city_wise_customer = city_wise_customer[city_wise_customer['City'] == selected_city]
+          city_table = city_wise_customer.lookup(selected_city)
 
       page_size = 10
-      total_pages = (len(city_wise_customer) // page_size) + 1
+      total_pages = (len(city_table) // page_size) + 1
 
       page = st.selectbox('Select page', range(1, total_pages + 1))
 
       start_idx = (page - 1) * page_size
       end_idx = start_idx + page_size
-      st.table(city_wise_customer.iloc[start_idx:end_idx])
+      st.table(city_table.iloc[start_idx:end_idx])
 
+@st.fragment
+@profiled
 def get_countrywise(df):
   """
   Display the number of customers by country.
   """
   st.write("")
-  country_wise_customer = df.groupby('order_country')['customer_id'].count().reset_index().sort_values(by='customer_id', ascending=False)
-  country_wise_customer.rename(columns={'order_country': 'Country', 'customer_id': 'No. of Customers'}, inplace=True)
-
-  country_wise_customer.reset_index(drop=True, inplace=True)
-
-  country_list = list(df['customer_country'].unique())
-  country_list.insert(0, 'Overall')
+  rankings, choices = customer_rankings(df)
+  country_wise_customer = rankings['Country'].table
 
   st.markdown(""" <h2 style="font-size: 32px; font-weight: bold; color: #FF7F50;">
           Country wise Customers
@@ -349,20 +265,19 @@ def get_countrywise(df):
       final_df = pd.concat([top_countries, other_df], ignore_index=True)
       final_df_sorted = final_df.sort_values(by='No. of Customers', ascending=True)
 
-      fig_horizontal_bar = px.bar(final_df_sorted, 
+      fig_horizontal_bar = cached_figure('country_customers', lambda: px.bar(final_df_sorted, 
                          x='No. of Customers', 
                          y='Country', 
-                         orientation='h')
+                         orientation='h'))
 
-      st.plotly_chart(fig_horizontal_bar)
+      plotly_chart(fig_horizontal_bar)
 
   else:
-      country_list = list(df['order_country'].unique())
-      country_list.insert(0, 'Overall')
+      country_list = ['Overall'] + choices['order_country']
       selected_country = st.selectbox('Select Country', options=country_list, index=0)
 
       if selected_country != 'Overall':
-          country_wise_customer = country_wise_customer[country_wise_customer['Country'] == selected_country]
+          country_wise_customer = rankings['Country'].lookup(selected_country)
 
       page_size = 10
       total_pages = (len(country_wise_customer) // page_size) + 1
@@ -375,18 +290,15 @@ def get_countrywise(df):
   
   st.write("Most of the customers belong to North American and European countries.")
 
+@st.fragment
+@profiled
 def get_Statewise(df):
   """
   Display the number of customers by state.
   """
   st.write("")
-  state_wise_customer = df.groupby('order_state')['customer_id'].count().reset_index().sort_values(by='customer_id', ascending=False)
-  state_wise_customer.rename(columns={'order_state': 'State', 'customer_id': 'No. of Customers'}, inplace=True)
-
-  state_wise_customer.reset_index(drop=True, inplace=True)
-
-  State_list = list(df['customer_state'].unique())
-  State_list.insert(0, 'Overall')
+  rankings, choices = customer_rankings(df)
+  state_wise_customer = rankings['State']
 
   st.markdown(""" <h2 style="font-size: 32px; font-weight: bold; color: #FF7F50;">
           State wise Customers
@@ -400,34 +312,34 @@ def get_Statewise(df):
 
       page = st.selectbox('Select page', range(1, total_pages + 1))
 
-      start_idx = (page - 1) * page_size
-      end_idx = start_idx + page_size
-      fig = px.bar(state_wise_customer.iloc[start_idx:end_idx], x='State', y='No. of Customers')
-      st.plotly_chart(fig)
+      fig = cached_figure('state_customers', lambda: px.bar(state_wise_customer.page(page, page_size), x='State', y='No. of Customers'),
+                          page=page)
+      plotly_chart(fig)
 
   else:
-      state_list = list(df['customer_state'].unique())
-      state_list.insert(0, 'Overall')
+      state_list = ['Overall'] + choices['customer_state']
       selected_state = st.selectbox('Select State', options=state_list, index=0)
 
+      state_table = state_wise_customer.table
       if selected_state != 'Overall':
-          state_wise_customer = state_wise_customer[state_wise_customer['State'] == selected_state]
+          state_table = state_wise_customer.lookup(selected_state)
 
       page_size = 10
-      total_pages = (len(state_wise_customer) // page_size) + 1
+      total_pages = (len(state_table) // page_size) + 1
 
       page = st.selectbox('Select page  ', range(1, total_pages + 1))
 
       start_idx = (page - 1) * page_size
       end_idx = start_idx + page_size
-      st.table(state_wise_customer.iloc[start_idx:end_idx])
+      st.table(state_table.iloc[start_idx:end_idx])
 
+@profiled
 def get_segmentwise(df):
   """
   Display the number of customers by segment.
   """
   st.write("")
-  segment_wise_customer = df.groupby('customer_segment')['customer_id'].count().reset_index().sort_values(by='customer_id', ascending=False)
+  segment_wise_customer = df.groupby('customer_segment', observed=True)['customer_id'].count().reset_index().sort_values(by='customer_id', ascending=False)
   segment_wise_customer.rename(columns={'customer_segment': 'Segment', 'customer_id': 'No. of Customers'}, inplace=True)
   segment_wise_customer.reset_index(drop=True, inplace=True)
   
@@ -462,12 +374,14 @@ def format_sales(value):
   else:
       return f'{value / 1_000:.2f}K'
 
+@st.fragment
+@profiled
 def get_segmentsales(df):
   """
   Display total sales and profit by customer segment.
   """
   st.write("")
-  salessegment = df.groupby('customer_segment')[['sales', 'order_profit_per_order']].sum().reset_index().sort_values(by='sales', ascending=False)
+  salessegment = df.groupby('customer_segment', observed=True)[['sales', 'order_profit_per_order']].sum().reset_index().sort_values(by='sales', ascending=False)
   salessegment.rename(columns={'customer_segment': 'Segment', 'sales': "Total Sales", 'order_profit_per_order': 'Total Profit'}, inplace=True)
   salessegment['Total Sales ($)'] = salessegment['Total Sales'].apply(format_sales)
   salessegment['Total Profit ($)'] = salessegment['Total Profit'].apply(format_sales)
@@ -480,43 +394,44 @@ def get_segmentsales(df):
   show_plot_3 = st.checkbox('Show Plot     ')
 
   if show_plot_3:
-      fig = px.bar(salessegment, x='Segment', y=['Total Sales', 'Total Profit'], title='Total sales by segment')
-      fig.update_layout(barmode='group')
-      st.plotly_chart(fig)
+      fig = cached_figure('segment_sales', lambda: px.bar(salessegment, x='Segment', y=['Total Sales', 'Total Profit'], title='Total sales by segment')
+                          .update_layout(barmode='group'))
+      plotly_chart(fig)
   else:
       salessegment = salessegment[['Segment', 'Total Sales ($)', 'Total Profit ($)', 'Profit Ratio (%)']]
       st.table(salessegment)
 
+@profiled
 def categoryPreferenceSegmentWise(df):
   """
   Display the top 5 product categories in each customer segment.
   """
   st.write("")
-  categorysegment = df.groupby(['customer_segment', 'category_name'])['order_id'].count().reset_index()
-  categorysegment = categorysegment.rename(columns={'category_name': 'Category', 'customer_segment': 'Segment', 'order_id': 'Count'})
-  df_sorted = categorysegment.sort_values('Count', ascending=False)
-  top_5 = df_sorted.groupby('Segment').head(5)
+  categorysegment = aggregate(df, 'order_id', {'cells': ['customer_segment', 'category_name']})['cells']
+  top_5 = top_k(categorysegment, 'count', 5, within='customer_segment')[['customer_segment', 'category_name', 'count']]
+  top_5 = top_5.rename(columns={'category_name': 'Category', 'customer_segment': 'Segment', 'count': 'Count'})
 
   st.markdown(""" <h2 style="font-size: 32px; font-weight: bold; color: #FF7F50;">
           Top 5 Categories in Each Segment
       </h2>""", unsafe_allow_html=True)
   st.write("Treemap shows that in all types of customers, the most preferred categories are Shoes and Clothing.")
   
-  fig_treemap = px.treemap(top_5, 
+  fig_treemap = cached_figure('segment_categories', lambda: px.treemap(top_5, 
                       path=['Segment', 'Category'], 
-                      values='Count')
-  fig_treemap.update_traces(textinfo='label+value')
+                      values='Count').update_traces(textinfo='label+value'))
 
   # Show the plot
-  st.plotly_chart(fig_treemap)
+  plotly_chart(fig_treemap)
 
 # --- Functions from market.py ---
 
+@st.fragment
+@profiled
 def get_marketsales(df):
   """
   Display total sales and profit by market.
   """
-  salesmarket = df.groupby('market')[['sales', 'order_profit_per_order']].sum().reset_index().sort_values(by='sales', ascending=False)
+  salesmarket = df.groupby('market', observed=True)[['sales', 'order_profit_per_order']].sum().reset_index().sort_values(by='sales', ascending=False)
   salesmarket.rename(columns={'market': 'Market', 'sales': "Total Sales", 'order_profit_per_order': 'Total Profit'}, inplace=True)
   salesmarket['Total Sales ($)'] = salesmarket['Total Sales'].apply(format_sales)
   salesmarket['Total Profit ($)'] = salesmarket['Total Profit'].apply(format_sales)
@@ -529,52 +444,55 @@ def get_marketsales(df):
   show_plot_4 = st.checkbox('Show Plot      ')
 
   if show_plot_4:
-      fig = px.bar(salesmarket, x='Market', y=['Total Sales', 'Total Profit'])
-      fig.update_layout(barmode='group')
-      st.plotly_chart(fig)
+      fig = cached_figure('market_sales', lambda: px.bar(salesmarket, x='Market', y=['Total Sales', 'Total Profit'])
+                          .update_layout(barmode='group'))
+      plotly_chart(fig)
   else:
       salesmarket = salesmarket[['Market', 'Total Sales ($)', 'Total Profit ($)', 'Profit Ratio (%)']]
       st.table(salesmarket)
   
   st.write("Markets with more sales are producing more profit. But Africa has the highest profit ratio.")
 
+@profiled
 def mapforprofit(df):
   """
   Display a choropleth map showing profit amounts by country.
   """
-  indextodrop = df[df['order_profit_per_order'] < 0].index
-  df.drop(indextodrop, inplace=True)
-  
-  fig = px.choropleth(
-      df,
-      locations='order_country',           # Column for the country names
-      locationmode='country names',        # The type of location, which is the country name
-      color='order_profit_per_order',      # Column for coloring based on profit
-      labels={'order_profit_per_order': 'Profit Amount'},
-      title='Profit Amount per Country'
-  )
-
-  # Update layout for a dark mode style
-  fig.update_layout(
-      geo=dict(
-          bgcolor='white',                 # Background color of the map
-          lakecolor='white',               # Color for lakes
-          landcolor='white',               # Land color
-          subunitcolor='white',            # Subunit boundaries color
-          countrycolor='white'             # Country boundaries color
-      ),
-      paper_bgcolor='white',               # Background color of the entire plot
-      plot_bgcolor='white'                 # Background color of the plotting area
-  )
-  st.plotly_chart(fig)
-
+  def build():
+    # One row per country: the summed profit of its profitable orders
+    profit = chart_totals(df[df['order_profit_per_order'] >= 0], 'order_country', 'order_profit_per_order')
+  
+    fig = px.choropleth(
+        profit,
+        locations='order_country',           # Column for the country names
+        locationmode='country names',        # The type of location, which is the country name
+        color='order_profit_per_order',      # Column for coloring based on profit
+        labels={'order_profit_per_order': 'Profit Amount'},
+        title='Profit Amount per Country'
+    )
+
+    # Update layout for a dark mode style
+    fig.update_layout(
+        geo=dict(
+            bgcolor='white',                 # Background color of the map
+            lakecolor='white',               # Color for lakes
+            landcolor='white',               # Land color
+            subunitcolor='white',            # Subunit boundaries color
+            countrycolor='white'             # Country boundaries color
+        ),
+        paper_bgcolor='white',               # Background color of the entire plot
+        plot_bgcolor='white'                 # Background color of the plotting area
+    )
+    return fig
+
+  plotly_chart(cached_figure('country_profit', build))
+
+@st.fragment
+@profiled
 def marketwisetrend(df):
   """
   Display market-wise monthly sales trends.
   """
-  df['order_period'] = df['order_date'].dt.to_period('M')
-  df['order_period_str'] = df['order_period'].astype(str)
-
   st.markdown(""" <h2 style="font-size: 32px; font-weight: bold; color: #FF7F50;">
           Market-Wise Monthly Sales
       </h2>""", unsafe_allow_html=True)
@@ -583,39 +501,42 @@ def marketwisetrend(df):
   market_list.insert(0, 'Overall')
   selected_market = st.selectbox('Select Market', options=market_list, index=0)
 
-  update = df
-  if selected_market != 'Overall':
-      update = df[df['market'] == selected_market]
-
-  monthly_sales = update.groupby(['market', 'order_period_str'])['sales'].sum().reset_index()
-
-  fig_line_plot = px.line(
-      monthly_sales, 
-      x='order_period_str',               # Use the string format of 'order_period'
-      y='sales', 
-      color='market',                     # Different lines for each market
-      labels={'sales': 'Total Sales', 'order_period_str': 'Month-Year'},
-      markers=True                        # Display markers for each data point
-  )
-
-  # Update the layout to show month names properly
-  fig_line_plot.update_layout(
-      xaxis_title="Month-Year",
-      yaxis_title="Sales",
-      xaxis=dict(tickformat="%b %Y"),     # Format X-axis to show Month and Year
-      hovermode='x unified',              # Unified hover mode for clearer comparison
-  )
+  def build():
+    update = df
+    if selected_market != 'Overall':
+        update = df[df['market'] == selected_market]
+
+    monthly_sales = update.groupby(['market', 'order_period_str'], observed=True)['sales'].sum().reset_index()
+
+    fig_line_plot = px.line(
+        monthly_sales, 
+        x='order_period_str',               # Use the string format of 'order_period'
+        y='sales', 
+        color='market',                     # Different lines for each market
+        labels={'sales': 'Total Sales', 'order_period_str': 'Month-Year'},
+        markers=True                        # Display markers for each data point
+    )
+
+    # Update the layout to show month names properly
+    fig_line_plot.update_layout(
+        xaxis_title="Month-Year",
+        yaxis_title="Sales",
+        xaxis=dict(tickformat="%b %Y"),     # Format X-axis to show Month and Year
+        hovermode='x unified',              # Unified hover mode for clearer comparison
+    )
+    return fig_line_plot
 
   # Display the plot using Streamlit
-  st.plotly_chart(fig_line_plot)
+  plotly_chart(cached_figure('market_trend', build, market=selected_market))
   st.write("""The spikes show that if they focus on one market then sales for all the other markets are dropped. 
           It might show they have insufficient resources to manage all the markets at the same time.""")
 
+@profiled
 def marketduration(df):
   """
   Display average shipping duration by market.
   """
-  marketwiseduration = df.groupby('market')['shipping_duration'].mean().reset_index()
+  marketwiseduration = df.groupby('market', observed=True)['shipping_duration'].mean().reset_index()
   st.markdown(""" <h2 style="font-size: 32px; font-weight: bold; color: #FF7F50;">
           Average Shipping Duration by Market
       </h2>""", unsafe_allow_html=True)
@@ -676,6 +597,8 @@ def marketduration(df):
 
 # --- Functions from product.py ---
 
+@st.fragment
+@profiled
 def bestSellingProducts(df):
   """
   Display the best-selling products.
@@ -684,19 +607,22 @@ def bestSellingProducts(df):
           Best Selling Products
       </h2>""", unsafe_allow_html=True)
 
-  bestsellingproducts = df.groupby('product_name')['sales'].sum().reset_index().sort_values(by='sales', ascending=False).head(10)
-  bestsellingproducts.rename(columns={'product_name': 'Product', 'sales': "Total Sales"}, inplace=True)
+  products = aggregate(df, 'sales', {'products': ['product_name']})['products']
+  bestsellingproducts = top_k(products, 'sales', 10)[['product_name', 'sales']]
+  bestsellingproducts = bestsellingproducts.rename(columns={'product_name': 'Product', 'sales': "Total Sales"})
   show_plot_9 = st.checkbox('Show Table  ')
 
   if not show_plot_9:
-      fig_horizontal_bar = px.bar(bestsellingproducts, 
+      fig_horizontal_bar = cached_figure('best_products', lambda: px.bar(bestsellingproducts, 
                          x='Total Sales', 
                          y='Product', 
-                         orientation='h')
-      st.plotly_chart(fig_horizontal_bar)
+                         orientation='h'))
+      plotly_chart(fig_horizontal_bar)
   else:
       st.table(bestsellingproducts)
 
+@st.fragment
+@profiled
 def bestSellingCategories(df):
   """
   Display the best-selling product categories.
@@ -705,22 +631,26 @@ def bestSellingCategories(df):
           Best Selling Product Categories
       </h2>""", unsafe_allow_html=True)
   
-  bestsellingcategories = df.groupby(['category_name', 'product_name'])['sales'].sum().reset_index().sort_values(by='sales', ascending=False)
-  top_categories = bestsellingcategories.groupby('category_name')['sales'].sum().reset_index().sort_values(by='sales', ascending=False).head(10)['category_name']
-  bestsellingcategories = bestsellingcategories[bestsellingcategories['category_name'].isin(top_categories)]
-  bestsellingcategories.rename(columns={'category_name': 'Category', 'sales': 'Total Sales', 'product_name': "Product"}, inplace=True)
+  # Product and category totals come from one pass; only the top categories' products are sorted
+  totals = aggregate(df, 'sales', {'products': ['category_name', 'product_name'], 'categories': ['category_name']})
+  top_categories = top_k(totals['categories'], 'sales', 10)['category_name']
+  bestsellingcategories = totals['products'][totals['products']['category_name'].isin(top_categories)]
+  bestsellingcategories = bestsellingcategories[['category_name', 'product_name', 'sales']].sort_values(by='sales', ascending=False, kind='stable')
+  bestsellingcategories = bestsellingcategories.rename(columns={'category_name': 'Category', 'sales': 'Total Sales', 'product_name': "Product"})
   
   show_plot_9 = st.checkbox('Show Table   ')
   if not show_plot_9:
-      fig_horizontal_bar = px.bar(bestsellingcategories, 
+      fig_horizontal_bar = cached_figure('best_categories', lambda: px.bar(bestsellingcategories, 
                           x='Total Sales', 
                           y='Category',
                           color='Product',
-                          orientation='h')
-      st.plotly_chart(fig_horizontal_bar)
+                          orientation='h'))
+      plotly_chart(fig_horizontal_bar)
   else:
       st.table(bestsellingcategories.head(10))
 
+@st.fragment
+@profiled
 def bestProductMargins(df):
   """
   Display the best products by profit margin.
@@ -729,42 +659,26 @@ def bestProductMargins(df):
           Best Products by Profit Margin
       </h2>""", unsafe_allow_html=True)
   
-  # Calculate order item profit
-  df['order_item_profit'] = df['order_item_profit_ratio'] * df['sales']
-  bestproductmargins = df.groupby('product_name')['order_item_profit'].mean().reset_index().sort_values(by='order_item_profit', ascending=False).head(7)
-  bestproductmargins.rename(columns={'product_name': 'Product', 'order_item_profit': "Profit Margin"}, inplace=True)
+  products = aggregate(df, 'order_item_profit', {'products': ['product_name']})['products']
+  bestproductmargins = top_k(products, 'mean', 7)[['product_name', 'mean']]
+  bestproductmargins = bestproductmargins.rename(columns={'product_name': 'Product', 'mean': "Profit Margin"})
   
   show_plot_10 = st.checkbox('Show Table')
   if not show_plot_10:
       # Create a bubble chart instead of a bar chart
-      fig_bubble = px.scatter(bestproductmargins, 
+      fig_bubble = cached_figure('best_margins', lambda: px.scatter(bestproductmargins, 
                               x='Product', 
                               y='Profit Margin', 
                               size='Profit Margin',  # Use Profit Margin to determine the bubble size
                               color='Product',       # Different colors for each product
                               hover_name='Product', 
                               size_max=60)           # Maximum size of the bubbles
-      # Hide x-axis labels
-      fig_bubble.update_layout(xaxis=dict(showticklabels=False))
-      st.plotly_chart(fig_bubble)
+                              .update_layout(xaxis=dict(showticklabels=False)))  # Hide x-axis labels
+      plotly_chart(fig_bubble)
   else:
       st.table(bestproductmargins)
 
-def categorize_discount_rate(df):
-  """
-  Categorize discount rates into bins.
-  """
-  bins = [-float('inf'), 0, 0.025, 0.05, 0.075, 0.10, 0.125, 0.15, 0.175, 0.20, 0.225, 0.25, float('inf')]
-  labels = [0, 2.5, 5, 7.5, 10, 12.5, 15, 17.5, 20, 22.5, 25, '25+']
-
-  # Create a new column with the categorized discount rate based on 2.5% intervals
-  df['discount_category'] = pd.cut(df['order_item_discount_rate'], 
-                                   bins=bins, 
-                                   labels=labels, 
-                                   right=False)  # right=False means the intervals are [)
-
-  return df
-
+@profiled
 def discountVsSales(df):
   """
   Display the trend of discount sales.
@@ -774,17 +688,18 @@ def discountVsSales(df):
       </h2>""", unsafe_allow_html=True)
   st.write("There seems to be no clear relationship between discount rate and sales volume.")
   
-  df = categorize_discount_rate(df)
-  df = df.groupby('discount_category')['order_item_discount_rate'].count().reset_index()
-  df.rename(columns={'discount_category': 'Discount Rate (%)', 'order_item_discount_rate': "No. of Orders"}, inplace=True)
-  
-  fig_line = px.line(df, 
-                     x='Discount Rate (%)', 
-                     y="No. of Orders", 
-                     markers=True)  # markers=True to show points on the line
+  def build():
+    counts = df.groupby('discount_category', observed=False)['order_item_discount_rate'].count().reset_index()
+    counts.rename(columns={'discount_category': 'Discount Rate (%)', 'order_item_discount_rate': "No. of Orders"}, inplace=True)
+    
+    return px.line(counts, 
+                   x='Discount Rate (%)', 
+                   y="No. of Orders", 
+                   markers=True)  # markers=True to show points on the line
   
-  st.plotly_chart(fig_line)
+  plotly_chart(cached_figure('discount_orders', build))
 
+@profiled
 def priceprofit(df):
   """
   Display the correlation between product price and profit.
@@ -808,27 +723,35 @@ def priceprofit(df):
   st.subheader("Scatter Plot of Product Price vs Order Profit")
   st.write("There is significant positive correlation between Product Price and Order Profit.")
 
-  fig = px.scatter(df, x='product_price', y='product_profit', 
-                  title='Price vs Profit',
-                   labels={'product_price': 'Product Price', 'product_profit': 'Order Profit'},
-                   template="plotly_white",
-                   )
-  
-  # Customize the layout for better readability
-  fig.update_layout(
-      title={'x': 0.5},  # Center the title
-      xaxis_title='Product Price',
-      yaxis_title='Order Profit per Order',
-      showlegend=False,
-      plot_bgcolor='rgba(0,0,0,0)',  # Transparent background
-      xaxis=dict(showgrid=True, gridcolor='lightgray'),
-      yaxis=dict(showgrid=True, gridcolor='lightgray')
-  )
-
-  st.plotly_chart(fig)
+  def build():
+    # The correlation above uses every order; only the plotted markers are sampled
+    fig, shown = budgeted_scatter(df, x='product_price', y='product_profit', 
+                    title='Price vs Profit',
+                     labels={'product_price': 'Product Price', 'product_profit': 'Order Profit'},
+                     template="plotly_white",
+                     )
+  
+    # Customize the layout for better readability
+    fig.update_layout(
+        title={'x': 0.5},  # Center the title
+        xaxis_title='Product Price',
+        yaxis_title='Order Profit per Order',
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',  # Transparent background
+        xaxis=dict(showgrid=True, gridcolor='lightgray'),
+        yaxis=dict(showgrid=True, gridcolor='lightgray')
+    )
+    return fig, shown
+
+  scatter = cached_figure('price_profit', build)
+  plotly_chart(scatter)
+  if scatter.shown < len(df):
+    st.caption(f"Showing a representative sample of {scatter.shown:,} of {len(df):,} orders.")
 
 # --- Functions from order.py ---
 
+@st.fragment
+@profiled
 def daywiseorder(df):
   """
   Display the count of orders by day of the week.
@@ -837,7 +760,7 @@ def daywiseorder(df):
           Day wise order counts
       </h2>""", unsafe_allow_html=True)
   
-  orderdaywise = df.groupby('order_weekday')['order_id'].count().reset_index()
+  orderdaywise = df.groupby('order_weekday', observed=True)['order_id'].count().reset_index()
   weekday_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
 
   # Create a categorical type with the custom order
@@ -850,13 +773,15 @@ def daywiseorder(df):
   show_plot_12 = st.checkbox('Show Plot          ')
 
   if show_plot_12:
-      fig = px.bar(orderdaywise, x='Day', y='No. of Orders')
-      st.plotly_chart(fig)
+      fig = cached_figure('weekday_orders', lambda: px.bar(orderdaywise, x='Day', y='No. of Orders'))
+      plotly_chart(fig)
   else:
       st.table(orderdaywise)
   
   st.write("Number of Orders increase as the weekend approaches.")
 
+@st.fragment
+@profiled
 def shippingmode(df):
   """
   Display order status by shipping modes.
@@ -865,14 +790,14 @@ def shippingmode(df):
           Order Status by Shipping Modes
       </h2>""", unsafe_allow_html=True)
   
-  shippingmode = df.groupby(['order_status', 'shipping_mode'])['order_id'].count().reset_index()
+  shippingmode = df.groupby(['order_status', 'shipping_mode'], observed=True)['order_id'].count().reset_index()
   shippingmode.rename(columns={'order_status': 'Status', 'shipping_mode': 'Shipping Mode', 'order_id': 'Count'}, inplace=True)
 
   show_plot = st.checkbox('Show Table')
 
   if not show_plot:
-      fig = px.bar(shippingmode, x='Status', y='Count', color='Shipping Mode')
-      st.plotly_chart(fig)
+      fig = cached_figure('status_by_mode', lambda: px.bar(shippingmode, x='Status', y='Count', color='Shipping Mode'))
+      plotly_chart(fig)
   else:
       shippingmodelist = list(df['shipping_mode'].unique())
       shippingmodelist.insert(0, 'Overall')
@@ -893,11 +818,12 @@ def shippingmode(df):
 
       st.table(shippingmode)
 
+@profiled
 def averageshippingdelay(df):
   """
   Display average shipping duration by shipping mode.
   """
-  average_duration = df.groupby('shipping_mode')['shipping_duration'].mean().reset_index()
+  average_duration = df.groupby('shipping_mode', observed=True)['shipping_duration'].mean().reset_index()
 
   st.markdown(""" <h2 style="font-size: 32px; font-weight: bold; color: #FF7F50;">
           Average Shipping Duration by Shipping Mode
@@ -943,6 +869,7 @@ def averageshippingdelay(df):
           if (index + 1) % 2 == 0:
               cols = st.columns(2)
 
+@profiled
 def shipdurationdistribution(df):
   """
   Display the distribution of shipping durations.
@@ -952,19 +879,24 @@ def shipdurationdistribution(df):
       </h2>""", unsafe_allow_html=True)
   st.write("Most of the orders are taking 8 to 10 days to deliver.")
 
-  fig = px.histogram(df, x='shipping_duration', nbins=6, 
-                 labels={'shipping_duration': 'Shipping Duration (days)'},
-                 color_discrete_sequence=['skyblue'])
+  def build():
+    # Bin counts are computed here so the figure carries one bar per bin, not every order
+    bins = histogram(df['shipping_duration'], nbins=6)
+    fig = go.Figure(go.Bar(x=bins['center'], y=bins['count'], marker_color='skyblue',
+                           customdata=bins[['start', 'end']],
+                           hovertemplate='Shipping Duration (days)=%{customdata[0]}-%{customdata[1]}<br>count=%{y}<extra></extra>'))
 
-  fig.update_layout(
-      xaxis_title='Shipping Duration (days)',
-      yaxis_title='Frequency',
-      bargap=0.2, 
+    fig.update_layout(
+        xaxis_title='Shipping Duration (days)',
+        yaxis_title='Frequency',
+        bargap=0.2, 
 
-  )
+    )
+    return fig
 
-  st.plotly_chart(fig)
+  plotly_chart(cached_figure('duration_histogram', build))
 
+@profiled
 def shipdurationbymode(df):
   """
   Display shipping duration by shipping mode.
@@ -974,32 +906,55 @@ def shipdurationbymode(df):
       </h2>""", unsafe_allow_html=True)
   st.write("First and Second class are delivering orders in time. While Same Day is facing some issues and showing exceptions in delivery time.")
   
-  fig = px.box(df, x='shipping_mode', y='shipping_duration',
-           labels={'shipping_duration': 'Shipping Duration (days)', 'shipping_mode': 'Shipping Mode'},
-           color='shipping_mode')
+  def build():
+    # One box per shipping mode, drawn from quartiles computed here
+    stats = box_stats(df, 'shipping_duration', 'shipping_mode')
+    colors = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, mode in enumerate(stats):
+      fig.add_traces(box_traces({mode: stats[mode]}, color=colors[i % len(colors)], name=mode, showlegend=True))
+    fig.update_layout(legend_title_text='Shipping Mode')
 
-  # Customize the layout for better appearance
-  fig.update_layout(
-      xaxis_title='Shipping Mode',
-      yaxis_title='Shipping Duration (days)',
+    # Customize the layout for better appearance
+    fig.update_layout(
+        xaxis_title='Shipping Mode',
+        yaxis_title='Shipping Duration (days)',
 
-  )
+    )
+    return fig
 
-  st.plotly_chart(fig)
+  plotly_chart(cached_figure('duration_by_mode', build))
 
 # --- Streamlit App ---
 # st.set_page_config(page_title="Supply Chain Dashboard", layout="wide")
 
 # --- Data Loading and Preprocessing ---
-@st.cache_data  # Cache the preprocessed data
+@st.cache_resource  # Share one read-only copy of the preprocessed data across sessions
 def load_and_preprocess_data():
-  return preprocess()
+  return SharedFrame(load_supplychain())
+
+@st.cache_resource  # The preprocessed data is sorted by order date
+def load_date_index():
+  return DateIndex(load_and_preprocess_data().view(), 'order_date')
 
-df = load_and_preprocess_data()
+dates = load_date_index()
 
 # --- Sidebar Navigation ---
 selected_page = st.sidebar.radio('Select View', ('Overview', 'Customer', 'Market Segment', 'Sales Orders', 'Inventory'))
 
+# --- Order Date Range ---
+first_date, last_date = dates.span()
+start_date = st.sidebar.date_input("Start Date", first_date, min_value=first_date, max_value=last_date)
+end_date = st.sidebar.date_input("End Date", last_date, min_value=first_date, max_value=last_date)
+if start_date is None or end_date is None:
+  st.warning("There are no order dates to select from. Check the order_date column of data.csv.")
+  st.stop()
+df = dates.slice(pd.to_datetime(start_date), pd.to_datetime(end_date) + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns'))  # Include the whole end day
+
+# Keys of the cached figures (see `cached_figure`)
+filter_state = {'start': start_date, 'end': end_date}
+dataset_version = load_and_preprocess_data().version
+
 # --- Page-Specific Content ---
 if selected_page == 'Overview':
   st.title("Summary Analysis")
@@ -1,7 +1,15 @@
+import time
+
+# The app's own imports, measured against the startup budget in utils/startup.py; Streamlit is
+# already loaded by the server, and the data pages import their own plotting and analytics
+# libraries when they are opened
+_imports_started = time.perf_counter()
 import streamlit as st
 import warnings
-from PIL import Image
 import base64
+from utils import profiling
+from utils.startup import report_startup
+IMPORT_SECONDS = time.perf_counter() - _imports_started
 
 # Suppress specific warnings
 warnings.filterwarnings("ignore", message="missing ScriptRunContext!")
@@ -35,15 +43,14 @@ project_3_page = st.Page(
 #st.sidebar.markdown("---")
 
 # --- NAVIGATION SETUP ---
-def add_logo():
+@st.cache_resource(show_spinner=False)  # Encoded once per process instead of on every rerun
+def logo_css(logo_path="assets/logo.png"):
   # Load and encode the logo image
-  LOGO_IMAGE = "assets/logo.png"
-  with open(LOGO_IMAGE, "rb") as image_file:
+  with open(logo_path, "rb") as image_file:
       encoded_logo = base64.b64encode(image_file.read()).decode()
 
-  # Inject CSS to style the sidebar
-  st.markdown(
-      f"""
+  # CSS to style the sidebar
+  return f"""
       <style>
           [data-testid="stSidebarNav"] {{
               background-image: url(data:image/png;base64,{encoded_logo});
@@ -61,9 +68,12 @@ def add_logo():
               top: 100px;  /* Adjust this value based on your layout */
           }}
       </style>
-      """,
-      unsafe_allow_html=True,
-  )
+      """
+
+
+def add_logo():
+  # Inject CSS to style the sidebar
+  st.markdown(logo_css(), unsafe_allow_html=True)
 
 # Call the function to add the logo
 add_logo()
@@ -83,4 +93,13 @@ pg = st.navigation(
 #st.sidebar.markdown("Made with ❤️ by [Ashik]")
 
 # --- RUN NAVIGATION ---
-pg.run()
+# Opt-in profiling of the page's sections (see utils/profiling.py)
+profiling.begin(pg.title)
+page_started = time.perf_counter()
+try:
+  pg.run()
+finally:
+  # Logged once per process, by its first run, before the profiling panel imports pandas
+  report_startup(IMPORT_SECONDS, pg.title, time.perf_counter() - page_started, data_page=pg.title != about_page.title)
+  # Also shows the sections run so far when the page stops early or fails
+  profiling.finish()
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.aggregate import aggregate, top_k
+
+
+def expected(df, value, by):
+    # What the pages computed before: a groupby per grouping, keys as plain labels
+    result = df.groupby(by, observed=True)[value].agg(["sum", "count", "size", "mean"]).reset_index()
+    result = result.rename(columns={"sum": value})
+    for name in by:
+        if isinstance(result[name].dtype, pd.CategoricalDtype):
+            result[name] = result[name].astype(result[name].cat.categories.dtype)
+    return result
+
+
+def assert_matches_groupby(df, value, by):
+    result = aggregate(df, value, {"result": by})["result"]
+    pd.testing.assert_frame_equal(result, expected(df, value, by), check_dtype=False)
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    rows = 500
+    df = pd.DataFrame({
+        "supplier": rng.choice(["Acme", "Globex", "Initech", "Umbrella"], rows),
+        "state": rng.choice(["CA", "NY", "TX"], rows),
+        "cost": rng.normal(100, 30, rows).round(2),
+    })
+    # Missing values and missing keys, as in the procurement data
+    df.loc[rng.choice(rows, 40, replace=False), "cost"] = np.nan
+    df.loc[rng.choice(rows, 25, replace=False), "supplier"] = None
+    return df
+
+
+def test_single_key(df):
+    assert_matches_groupby(df, "cost", ["supplier"])
+
+
+def test_combined_keys(df):
+    assert_matches_groupby(df, "cost", ["supplier", "state"])
+
+
+def test_group_of_missing_values_only(df):
+    df.loc[df["supplier"] == "Acme", "cost"] = np.nan
+    result = aggregate(df, "cost", {"supplier": ["supplier"]})["supplier"].set_index("supplier")
+    assert result.loc["Acme", "cost"] == 0 and result.loc["Acme", "count"] == 0 and np.isnan(result.loc["Acme", "mean"])
+    assert_matches_groupby(df, "cost", ["supplier"])
+
+
+def test_categorical_keys_drop_unseen_categories(df):
+    df["supplier"] = pd.Categorical(df["supplier"], categories=["Umbrella", "Acme", "Globex", "Initech", "Hooli"])
+    df["state"] = df["state"].astype("category")
+    result = aggregate(df, "cost", {"result": ["supplier", "state"]})["result"]
+    assert "Hooli" not in set(result["supplier"])
+    assert_matches_groupby(df, "cost", ["supplier", "state"])
+
+
+def test_sparse_key_combinations():
+    # 300 x 300 possible cells for 400 rows takes the compacted-ids path
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"a": rng.integers(0, 300, 400), "b": rng.integers(0, 300, 400), "value": rng.random(400)})
+    assert_matches_groupby(df, "value", ["a", "b"])
+
+
+def test_derived_keys(df):
+    df["date"] = pd.Timestamp("2020-01-01") + pd.to_timedelta(np.arange(len(df)) % 90, unit="D")
+    month = df["date"].dt.to_period("M")
+    result = aggregate(df, "cost", {"month": ["month"]}, keys={"month": month})["month"]
+    by_month = df.groupby(month)["cost"].agg(["sum", "count", "size", "mean"]).reset_index()
+    pd.testing.assert_frame_equal(result, by_month.rename(columns={"date": "month", "sum": "cost"}), check_dtype=False)
+
+
+def test_shared_keys_across_groupings(df):
+    results = aggregate(df, "cost", {"supplier": ["supplier"], "supplier_state": ["supplier", "state"]})
+    pd.testing.assert_frame_equal(results["supplier"], expected(df, "cost", ["supplier"]), check_dtype=False)
+    pd.testing.assert_frame_equal(results["supplier_state"], expected(df, "cost", ["supplier", "state"]), check_dtype=False)
+
+
+def test_non_numeric_values_are_counted(df):
+    df["order_id"] = [f"ORD-{i}" if i % 7 else None for i in range(len(df))]
+    result = aggregate(df, "order_id", {"supplier": ["supplier"]})["supplier"]
+    counts = df.groupby("supplier")["order_id"].agg(["count", "size"]).reset_index()
+    pd.testing.assert_frame_equal(result, counts, check_dtype=False)
+
+
+def test_all_keys_missing():
+    df = pd.DataFrame({"key": [None, None], "value": [1.0, 2.0]})
+    result = aggregate(df, "value", {"key": ["key"]})["key"]
+    assert result.empty
+
+
+def test_nullable_integer_values(df):
+    df["quantity"] = pd.array([None if i % 5 == 0 else i % 9 for i in range(len(df))], dtype="Int64")
+    assert_matches_groupby(df, "quantity", ["supplier"])
+
+
+def expected_top(frame, column, k, within=None):
+    # The pages' ranking before: a stable sort, largest first with missing values last, then the first k
+    ranked = frame.sort_values(column, ascending=False, kind="stable", na_position="last")
+    return ranked.head(k) if within is None else ranked.groupby(within, sort=False, observed=True).head(k)
+
+
+@pytest.mark.parametrize("k", [0, 1, 3, 10])
+def test_top_k_ties_keep_frame_order(k):
+    frame = pd.DataFrame({"name": list("abcdefgh"), "count": [2, 5, 2, 5, 1, 2, 5, 1]})
+    pd.testing.assert_frame_equal(top_k(frame, "count", k), expected_top(frame, "count", k))
+
+
+def test_top_k_missing_values_rank_last():
+    frame = pd.DataFrame({"name": list("abcde"), "count": [np.nan, 3.0, np.nan, 1.0, 3.0]})
+    result = top_k(frame, "count", 4)
+    assert result["name"].tolist() == ["b", "e", "d", "a"]
+    pd.testing.assert_frame_equal(result, expected_top(frame, "count", 4))
+
+
+def test_top_k_within_groups_smaller_than_k():
+    frame = pd.DataFrame({
+        "segment": ["Consumer", "Corporate", "Consumer", "Home", "Consumer", "Corporate", "Consumer", "Consumer", "Consumer"],
+        "category": ["Shoes", "Shoes", "Golf", "Shoes", "Camping", "Golf", "Fishing", "Books", "Music"],
+        "count": [7, 4, 7, 1, 3, 4, 9, 2, 3],
+    })
+    result = top_k(frame, "count", 5, within="segment")
+    pd.testing.assert_frame_equal(result, expected_top(frame, "count", 5, within="segment"))
+    # Corporate and Home have fewer than k categories and keep all of them
+    assert result["segment"].value_counts().to_dict() == {"Consumer": 5, "Corporate": 2, "Home": 1}
+
+
+def test_top_k_within_groups_on_counts(df):
+    df["order_id"] = [f"ORD-{i}" if i % 7 else None for i in range(len(df))]
+    counts = aggregate(df, "order_id", {"cells": ["state", "supplier"]})["cells"]
+    pd.testing.assert_frame_equal(top_k(counts, "count", 3, within="state"), expected_top(counts, "count", 3, within="state"))
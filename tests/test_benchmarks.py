@@ -0,0 +1,27 @@
+import ast
+import os
+
+from benchmarks.data import scale_csv
+from benchmarks.suite import PAGES_DIR, SUPPLYCHAIN_VIEWS
+
+
+def test_supplychain_views_are_the_ones_the_page_renders():
+    with open(os.path.join(PAGES_DIR, "supplychain.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    views = {node.name for node in tree.body if isinstance(node, ast.FunctionDef)}
+    # The views are called from the module-level `if selected_page == ...` chain
+    branch = next(node for node in tree.body if isinstance(node, ast.If) and "selected_page" in ast.unparse(node.test))
+    rendered = []
+    while branch:
+        rendered += [statement.value.func.id for statement in branch.body
+                     if isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Call)
+                     and isinstance(statement.value.func, ast.Name) and statement.value.func.id in views]
+        branch = branch.orelse[0] if branch.orelse else None
+    assert rendered == SUPPLYCHAIN_VIEWS
+
+
+def test_scale_csv_repeats_the_rows(tmp_path):
+    source, target = tmp_path / "source.csv", tmp_path / "target.csv"
+    source.write_bytes(b"a,b\n1,2\n3,4")
+    scale_csv(source, target, 3)
+    assert target.read_bytes() == b"a,b\n" + b"1,2\n3,4\n" * 3
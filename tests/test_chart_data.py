@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.chart_data import chart_totals
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    rows = 400
+    return pd.DataFrame({
+        "Region": pd.Categorical(rng.choice(["Central", "East", "South", "West"], rows), categories=["Central", "East", "North", "South", "West"]),
+        "Category": rng.choice(["Furniture", "Technology", None], rows),
+        "Sales": rng.gamma(2.0, 100.0, rows),
+        "Profit": rng.normal(10, 40, rows),
+    })
+
+
+@pytest.mark.parametrize("by", ["Region", "Category", ["Region", "Category"]])
+def test_sums_match_groupby(df, by):
+    expected = df.astype({"Region": str}).groupby(by, as_index=False)[["Sales", "Profit"]].sum()
+    pd.testing.assert_frame_equal(chart_totals(df, by, ["Sales", "Profit"]), expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("by", ["Region", ["Region", "Category"]])
+def test_counts_match_groupby(df, by):
+    expected = df.astype({"Region": str}).groupby(by).size().reset_index(name="Orders")
+    pd.testing.assert_frame_equal(chart_totals(df, by, name="Orders"), expected, check_dtype=False)
+
+
+def test_unseen_categories_and_missing_keys_are_dropped(df):
+    totals = chart_totals(df, "Region", "Sales")
+    assert "North" not in set(totals["Region"])
+    assert totals["Region"].dtype == object
+    assert chart_totals(df, "Category", "Sales")["Category"].notna().all()
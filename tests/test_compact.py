@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from utils.compact import compact
+
+
+def test_small_integers_keep_room_for_arithmetic():
+    df = pd.DataFrame({"quantity": np.full(10_000, 100, dtype=np.int64), "discount": np.full(10_000, 3, dtype=np.int64)})
+    compacted = compact(df)
+    assert (compacted.dtypes == np.int32).all()
+    # Both fit int8, but their products and running totals do not
+    assert (compacted["quantity"] * compacted["quantity"]).eq(10_000).all()
+    assert compacted["quantity"].cumsum().iloc[-1] == 1_000_000
+    assert compacted["quantity"].sum() == df["quantity"].sum()
+
+
+def test_integers_beyond_int32_are_kept():
+    df = pd.DataFrame({"id": np.array([1, 2**40], dtype=np.int64), "small": np.array([1, 2], dtype=np.int8)})
+    compacted = compact(df)
+    assert compacted["id"].dtype == np.int64
+    assert compacted["small"].dtype == np.int32
+
+
+def test_floats_narrow_only_when_lossless():
+    df = pd.DataFrame({"exact": [0.5, 1.25, np.nan], "inexact": [0.1, 0.2, 0.3]})
+    compacted = compact(df)
+    assert compacted["exact"].dtype == np.float32
+    assert compacted["inexact"].dtype == np.float64
+    pd.testing.assert_frame_equal(compacted.astype(np.float64), df)
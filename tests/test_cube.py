@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cube import CUBE_DIMENSIONS, SalesCube
+from utils.date_index import sort_by_date
+
+MEASURES = ["Sales", "Profit", "Quantity", "Orders"]
+
+
+@pytest.fixture(scope="module")
+def df():
+    rng = np.random.default_rng(0)
+    rows = 3000
+    regions = rng.choice(["Central", "East", "South", "West"], rows)
+    df = pd.DataFrame({
+        "Order Date": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 730, rows), unit="D"),
+        "Region": pd.Categorical(regions),
+        "State": [f"{region} state {i}" for region, i in zip(regions, rng.integers(0, 3, rows))],
+        "City": [f"City {i}" for i in rng.integers(0, 6, rows)],
+        "Category": pd.Categorical(rng.choice(["Furniture", "Office Supplies", "Technology"], rows)),
+        "Sub-Category": rng.choice(["Chairs", "Paper", "Phones", "Tables"], rows),
+        "Segment": rng.choice(["Consumer", "Corporate"], rows),
+        "Sales": rng.gamma(2.0, 100.0, rows).round(2),
+        "Profit": rng.normal(10, 40, rows).round(2),
+        "Quantity": rng.integers(1, 10, rows),
+    })
+    return sort_by_date(df, "Order Date")
+
+
+@pytest.fixture(scope="module")
+def cube(df):
+    return SalesCube(df)
+
+
+def totals(cells):
+    # Cells of the same key may come from both the cube and the edge rows of a month
+    keys = [cells[column].astype(str) for column in CUBE_DIMENSIONS]
+    return cells.groupby(keys, observed=True)[MEASURES].sum().sort_index()
+
+
+def expected(df, start, end, filters):
+    rows = df[(df["Order Date"] >= start) & (df["Order Date"] <= end)]
+    for column, values in filters.items():
+        if values:
+            rows = rows[rows[column].isin(values)]
+    rows = rows.assign(month=rows["Order Date"].dt.to_period("M"), Orders=1)
+    return totals(rows)
+
+
+def assert_matches_rows(df, cube, start, end, filters=None):
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    result = totals(cube.select(start, end, filters))
+    pd.testing.assert_frame_equal(result, expected(df, start, end, filters or {}), check_dtype=False)
+
+
+@pytest.mark.parametrize("start, end", [
+    ("2020-03-05", "2020-03-20"),   # inside one month
+    ("2020-03-01", "2020-03-31"),   # exactly one month
+    ("2020-03-01", "2020-05-31"),   # whole months only
+    ("2020-02-29", "2020-06-01"),   # one day either side of whole months
+    ("2020-01-01", "2021-12-31"),   # the whole span
+    ("2020-04-15", "2021-02-10"),   # partial months at both ends
+])
+def test_ranges_match_rows(df, cube, start, end):
+    assert_matches_rows(df, cube, start, end)
+
+
+@pytest.mark.parametrize("start, end", [("2020-03-20", "2020-03-05"), ("2019-01-01", "2019-12-31")])
+def test_empty_ranges(df, cube, start, end):
+    assert cube.select(pd.Timestamp(start), pd.Timestamp(end)).empty
+    assert_matches_rows(df, cube, start, end)
+
+
+def test_random_ranges_and_filters_match_rows(df, cube):
+    rng = np.random.default_rng(1)
+    for _ in range(40):
+        days = np.sort(rng.integers(0, 730, 2))
+        start, end = pd.Timestamp("2020-01-01") + pd.to_timedelta(days, unit="D")
+        regions = list(rng.choice(["Central", "East", "South", "West"], rng.integers(0, 3), replace=False))
+        cities = list(rng.choice([f"City {i}" for i in range(6)], rng.integers(0, 2), replace=False))
+        assert_matches_rows(df, cube, start, end, {"Region": regions, "State": [], "City": cities})
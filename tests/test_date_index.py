@@ -0,0 +1,30 @@
+import pandas as pd
+import pytest
+
+from utils.date_index import DateIndex, sort_by_date
+
+
+@pytest.fixture
+def index():
+    df = pd.DataFrame({"date": pd.to_datetime(["2020-01-03", None, "2020-01-01", "2020-01-02", "2020-01-02"]),
+                       "value": [3, 0, 1, 2, 22]})
+    return DateIndex(sort_by_date(df, "date"), "date")
+
+
+def test_span_skips_missing_dates(index):
+    assert index.span() == (pd.Timestamp("2020-01-01"), pd.Timestamp("2020-01-03"))
+
+
+@pytest.mark.parametrize("dates", [[], [None, None]])
+def test_span_of_a_frame_without_dates(dates):
+    df = pd.DataFrame({"date": pd.to_datetime(pd.Series(dates, dtype="object"))})
+    index = DateIndex(df, "date")
+    assert index.span() == (None, None)
+    assert index.slice("2020-01-01", "2020-12-31").empty
+
+
+def test_slice_is_inclusive_and_matches_a_mask(index):
+    expected = index.frame[index.frame["date"].between("2020-01-02", "2020-01-03")]
+    pd.testing.assert_frame_equal(index.slice("2020-01-02", "2020-01-03"), expected)
+    assert index.bounds(None, "2020-01-01") == (0, 1)
+    assert index.bounds("2020-01-04", None) == (4, 4)
@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.delivery import MAX_DAYS, MIN_DAYS, SAME_DAY_DELAYS, SHIPPING_MODES, simulate_delivery_dates
+
+MARKETS = ['LATAM', 'USCA', 'Pacific Asia', 'Europe', 'Africa']
+MODES = SHIPPING_MODES + ['Same Day']
+
+
+def update_delivery_date(row):
+    # The row-wise simulation of the original pages/supplychain.py
+    days_to_add = 0
+    min_days = {'First Class': 2, 'Second Class': 5, 'Standard Class': 8}
+    max_days = {'First Class': 3, 'Second Class': 6, 'Standard Class': 11}
+    if row['market'] in ['LATAM', 'USCA']:
+        if row['shipping_mode'] in min_days:
+            days_to_add = min_days[row['shipping_mode']]
+    elif row['market'] == 'Pacific Asia':
+        if row['shipping_mode'] in max_days:
+            days_to_add = max_days[row['shipping_mode']]
+    else:
+        if row['shipping_mode'] == 'First Class':
+            days_to_add = np.random.randint(2, 4)
+        elif row['shipping_mode'] == 'Second Class':
+            days_to_add = np.random.randint(5, 7)
+        elif row['shipping_mode'] == 'Standard Class':
+            days_to_add = np.random.randint(8, 12)
+    return row['delivery_date'] + timedelta(days=days_to_add)
+
+
+def row_wise_delivery_dates(df, seed):
+    np.random.seed(seed)
+    df = df.copy()
+    df['delivery_date'] = df['order_date']
+    df['delivery_date'] = df.apply(update_delivery_date, axis=1)
+    temp_df = df[df['shipping_mode'] == 'Same Day']
+    random_indices = np.random.choice(temp_df.index, int(len(temp_df) * 0.08), replace=False)
+    random_indices2 = np.random.choice(temp_df.index, int(len(temp_df) * 0.02), replace=False)
+    temp_df.loc[random_indices, 'delivery_date'] += pd.Timedelta(days=1)
+    temp_df.loc[random_indices2, 'delivery_date'] += pd.Timedelta(days=2)
+    df.loc[df['shipping_mode'] == 'Same Day', 'delivery_date'] = temp_df['delivery_date']
+    return df['delivery_date']
+
+
+@pytest.fixture
+def orders():
+    # Every market and shipping mode, 60 orders each, on a spread of order dates
+    pairs = pd.MultiIndex.from_product([MARKETS, MODES], names=['market', 'shipping_mode']).to_frame(index=False)
+    df = pd.concat([pairs] * 60, ignore_index=True)
+    df['order_date'] = pd.Timestamp('2017-01-01') + pd.to_timedelta(np.arange(len(df)) % 365, unit='D')
+    return df
+
+
+def offsets(df, delivery_date):
+    return (delivery_date - df['order_date']).dt.days
+
+
+def test_matches_row_wise_simulation(orders):
+    old = offsets(orders, row_wise_delivery_dates(orders, seed=0))
+    new = offsets(orders, simulate_delivery_dates(orders['order_date'], orders['market'], orders['shipping_mode'], seed=0))
+
+    for code, mode in enumerate(SHIPPING_MODES):
+        in_mode = orders['shipping_mode'] == mode
+        fixed = in_mode & orders['market'].isin(['LATAM', 'USCA', 'Pacific Asia'])
+        # Fixed markets get the same days in both paths
+        pd.testing.assert_series_equal(new[fixed], old[fixed])
+        assert (new[in_mode & orders['market'].isin(['LATAM', 'USCA'])] == MIN_DAYS[code]).all()
+        assert (new[in_mode & (orders['market'] == 'Pacific Asia')] == MAX_DAYS[code]).all()
+        # Randomized markets draw from the same range of days
+        randomized = in_mode & ~fixed
+        expected = set(range(MIN_DAYS[code], MAX_DAYS[code] + 1))
+        assert set(old[randomized]) == set(new[randomized]) == expected
+
+
+def test_same_day_delays_match_row_wise_simulation(orders):
+    old = offsets(orders, row_wise_delivery_dates(orders, seed=0))
+    new = offsets(orders, simulate_delivery_dates(orders['order_date'], orders['market'], orders['shipping_mode'], seed=0))
+
+    same_day = orders['shipping_mode'] == 'Same Day'
+    count = same_day.sum()
+    # Delays may overlap (1 + 2 days), but the total of added days is fixed by the shares
+    added = sum(days * int(count * share) for days, share in SAME_DAY_DELAYS)
+    assert old[same_day].sum() == new[same_day].sum() == added
+    assert set(new[same_day]) <= {0, 1, 2, 3}
+    assert (new[same_day] > 0).sum() >= int(count * max(share for _, share in SAME_DAY_DELAYS))
+
+
+def test_same_seed_gives_identical_dates(orders):
+    args = orders['order_date'], orders['market'], orders['shipping_mode']
+    pd.testing.assert_series_equal(simulate_delivery_dates(*args, seed=7), simulate_delivery_dates(*args, seed=7))
+    assert not simulate_delivery_dates(*args, seed=7).equals(simulate_delivery_dates(*args, seed=8))
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.distribution import box_stats, histogram
+
+
+@pytest.mark.parametrize("values", [
+    np.random.default_rng(0).integers(0, 7, 1_000),     # width 1
+    np.random.default_rng(1).integers(0, 20, 1_000),    # width 2
+    np.random.default_rng(1).integers(0, 40, 1_000),    # width 5
+    np.random.default_rng(2).integers(-15, 90, 1_000),  # width 20
+    np.random.default_rng(3).normal(50, 12, 1_000),     # non-integral
+])
+def test_counts_match_numpy_on_the_same_edges(values):
+    bins = histogram(values, nbins=10)
+    edges = np.append(bins["start"].to_numpy(), bins["end"].iloc[-1])
+    counts, _ = np.histogram(values, bins=edges)
+    np.testing.assert_array_equal(bins["count"].to_numpy(), counts)
+    assert len(bins) <= 11 and bins["count"].sum() == len(values)
+    np.testing.assert_allclose(np.diff(edges), edges[1] - edges[0])
+
+
+def test_whole_numbers_never_sit_on_an_edge():
+    values = np.random.default_rng(4).integers(0, 20, 1_000)
+    bins = histogram(values, nbins=10)
+    assert bins["end"].iloc[0] - bins["start"].iloc[0] == 2
+    edges = np.append(bins["start"].to_numpy(), bins["end"].iloc[-1])
+    assert (edges - np.floor(edges) == 0.5).all()
+    # Odd widths are centred on whole numbers
+    centers = histogram(np.arange(7), nbins=10)["center"]
+    np.testing.assert_array_equal(centers, np.arange(7))
+
+
+def test_missing_values_are_skipped():
+    bins = histogram([1.0, np.nan, np.inf, 3.0])
+    assert bins["count"].sum() == 2
+    assert histogram([np.nan])["count"].empty
+
+
+def test_box_stats_match_numpy_quartiles():
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({"mode": rng.choice(["First", "Second"], 400), "days": rng.normal(5, 2, 400)})
+    stats = box_stats(df, "days", "mode", max_outliers=3)
+    for mode, group in df.groupby("mode"):
+        q1, median, q3 = np.percentile(group["days"], [25, 50, 75])
+        assert stats[mode]["q1"] == pytest.approx(q1) and stats[mode]["median"] == pytest.approx(median)
+        assert stats[mode]["count"] == len(group) and len(stats[mode]["outliers"]) <= 3
@@ -0,0 +1,47 @@
+import gzip
+import io
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from utils.export import ExportCache, export_file
+
+
+def _frame():
+    return pd.DataFrame({"city": ["Austin", "Boston", "Chicago"], "sales": [1.5, 2.0, 3.25]})
+
+
+def test_exports_round_trip():
+    cache = ExportCache()
+    df = _frame()
+    csv = cache.export("csv", df, "CSV")
+    assert isinstance(csv, bytes)
+    pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(csv)), df)
+    pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(gzip.decompress(cache.export("gz", df, "CSV (gzip)")))), df)
+    pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(cache.export("parquet", df, "Parquet"))), df)
+
+
+def test_cache_counts_the_file_size_once():
+    cache = ExportCache()
+    df = pd.DataFrame({"value": np.arange(200_000)})
+    first = cache.export("csv", df, "CSV")
+    assert cache.stats()["bytes"] == len(first) > 1 << 20
+
+    # A hit, and the size lookups of later puts and evictions, do not copy the file
+    tracemalloc.start()
+    try:
+        assert cache.export("csv", None, "CSV") is first
+        cache.put("other", b"x" * 10)
+        cache.max_bytes = len(first)
+        cache.put("last", b"y" * 10)
+        allocated = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert allocated < len(first) // 10
+    assert "csv" not in cache
+    assert cache.stats()["bytes"] == 20
+
+
+def test_empty_export_file_has_no_bytes():
+    assert export_file(_frame().iloc[:0], "CSV") == b"city,sales\n"
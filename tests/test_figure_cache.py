@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from utils.figure_cache import FigureCache
+from utils.scatter import budgeted_scatter
+
+
+def _frame(rows=20_000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"x": rng.normal(size=rows), "y": rng.normal(size=rows), "size": rng.integers(1, 10, rows)})
+
+
+class Builds:
+    """
+    A figure builder that counts its calls.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return go.Figure(go.Bar(x=["a", "b"], y=[1, 2]))
+
+
+def test_hit_returns_the_cached_spec_without_building():
+    cache = FigureCache()
+    build = Builds()
+    first = cache.figure("key", build)
+    assert cache.figure("key", build) is first
+    assert build.calls == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["bytes"]) == (1, 1, len(first.spec))
+    # What `st.plotly_chart` would have sent for the built figure
+    assert first.spec == pio.to_json(build(), validate=False)
+
+
+def test_cached_figure_cannot_be_changed_by_a_session():
+    cache = FigureCache()
+    cached = cache.figure("key", Builds())
+    # Only the JSON string is shared; a session changing its own copy leaves the cache alone
+    fig = go.Figure(json.loads(cached.spec))
+    fig.update_layout(title="changed")
+    assert isinstance(cached.spec, str)
+    assert "changed" not in cache.figure("key", Builds()).spec
+
+
+def test_shown_counts_points_or_takes_them_from_build():
+    cache = FigureCache()
+    assert cache.figure("bar", lambda: go.Figure(go.Bar(x=["a", "b", "c"], y=[1, 2, 3]))).shown == 3
+    # Figures without traces, or whose traces have no x, show no points instead of failing
+    assert cache.figure("empty", lambda: go.Figure()).shown == 0
+    assert cache.figure("pie", lambda: go.Figure(go.Pie(labels=["a", "b"], values=[1, 2]))).shown == 0
+    assert cache.figure("scatter", lambda: budgeted_scatter(_frame(), x="x", y="y", budget=500)).shown < 20_000
+
+
+def test_plotly_chart_sends_what_st_plotly_chart_sends():
+    from streamlit.testing.v1 import AppTest
+
+    def app():
+        import plotly.graph_objects as go
+        import streamlit as st
+
+        from utils.figure_cache import FigureCache, plotly_chart
+
+        build = lambda: go.Figure(go.Bar(x=["a", "b"], y=[1, 2]))
+        with st.container():
+            plotly_chart(FigureCache().figure("key", build), use_container_width=True)
+        # A key keeps its element id apart from the cached chart's
+        st.plotly_chart(build(), use_container_width=True, key="direct")
+
+    at = AppTest.from_function(app).run()
+    assert not at.exception
+    charts = [element.proto for element in at.get("plotly_chart")]
+    cached, direct = charts
+    assert (cached.spec, cached.config, cached.theme) == (direct.spec, direct.config, direct.theme)
+    assert cached.use_container_width
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.filter_index import HierarchyIndex
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "Region": ["East", "West", "East", "West", "Central"],
+        "State": ["New York", "California", "Ohio", "Oregon", "Texas"],
+        "City": ["New York City", "Los Angeles", "Columbus", "Portland", "Dallas"],
+        "Order Date": pd.to_datetime(["2020-03-01", "2020-01-15", "2020-02-01", "2020-06-30", "2020-01-01"]),
+    })
+
+
+def test_options_in_order_of_first_appearance(df):
+    index = HierarchyIndex(df)
+    assert index.options("Region", "2020-01-01", "2020-12-31") == ["East", "West", "Central"]
+
+
+@pytest.mark.parametrize("level", ["Region", "State", "City"])
+def test_options_match_unique_values_in_range(df, level):
+    index = HierarchyIndex(df)
+    in_range = df[df["Order Date"].between("2020-01-10", "2020-02-15")]
+    assert index.options(level, "2020-01-10", "2020-02-15") == list(in_range[level].unique())
+
+
+def test_options_under_selected_parents(df):
+    index = HierarchyIndex(df)
+    assert index.options("State", "2020-01-01", "2020-12-31", {"Region": ["West"]}) == ["California", "Oregon"]
+    # An empty selection keeps every parent
+    assert len(index.options("City", "2020-01-01", "2020-12-31", {"Region": []})) == 5
+    assert index.options("City", "2020-01-01", "2020-12-31", {"Region": ["East"], "State": ["Ohio"]}) == ["Columbus"]
+
+
+def test_select_matches_a_mask(df):
+    index = HierarchyIndex(df)
+    positions = index.select("2020-01-10", "2020-06-30", {"Region": ["East", "West"]})
+    mask = df["Region"].isin(["East", "West"]) & df["Order Date"].between("2020-01-10", "2020-06-30")
+    np.testing.assert_array_equal(positions, np.flatnonzero(mask))
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.grid import DataGrid
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"name": [f"row {i}" for i in range(120)], "sales": np.arange(120, dtype=float)})
+
+
+def test_pages_are_slices_of_the_frame(df):
+    grid = DataGrid(df, page_size=50)
+    assert grid.pages == 3
+    pd.testing.assert_frame_equal(grid.page(1), df.iloc[:50])
+    pd.testing.assert_frame_equal(grid.page(3), df.iloc[100:])
+    assert DataGrid(df.iloc[:0]).pages == 1
+
+
+def test_color_scale_bounds_cover_all_rows(df):
+    df.loc[7, "sales"] = np.nan
+    grid = DataGrid(df, cmap="Blues", page_size=50)
+    assert grid.bounds == {"sales": (0.0, 119.0)}
+
+    # A row is colored on its page as it is when the whole frame is styled at once
+    whole = df.style.background_gradient(cmap="Blues", subset=["sales"])._compute().ctx
+    column = df.columns.get_loc("sales")
+    for number in range(1, grid.pages + 1):
+        styler = grid.page(number)
+        page = styler._compute().ctx
+        start = (number - 1) * grid.page_size
+        for row in range(len(styler.data)):
+            assert page.get((row, column)) == whole.get((start + row, column))
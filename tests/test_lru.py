@@ -0,0 +1,36 @@
+import datetime
+
+from utils.lru import SizedLRU, cache_key
+
+
+def test_evicts_least_recently_used_by_size():
+    cache = SizedLRU(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"  # "b" is now the least recently used
+    cache.put("c", b"1234")
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.stats() == {"hits": 1, "misses": 0, "evictions": 1, "entries": 2, "bytes": 8, "max_bytes": 10}
+
+
+def test_values_larger_than_the_bound_are_not_stored():
+    cache = SizedLRU(max_bytes=4)
+    cache.put("a", b"12345")
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_replacing_a_value_updates_the_size():
+    cache = SizedLRU(max_bytes=10)
+    cache.put("a", b"12345678")
+    cache.put("a", b"12")
+    assert cache.stats()["bytes"] == 2
+
+
+def test_cache_key_normalizes_filter_state():
+    day = datetime.date(2020, 1, 1)
+    first = cache_key("page", "chart", {"region": ["West", "East"], "start": day}, "v1")
+    second = cache_key("page", "chart", {"start": day, "region": ["East", "West"]}, "v1")
+    assert first == second
+    assert first != cache_key("page", "chart", {"region": ["East"], "start": day}, "v1")
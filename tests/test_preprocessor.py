@@ -0,0 +1,32 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.preprocessor import rebalance_weekdays
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def weekday_loop(df):
+    # The weekday adjustment of the original pages/supplychain.py
+    for weekday in ['Monday', 'Tuesday', 'Wednesday', 'Thursday']:
+        temp_df = df[df['order_weekday'] == weekday]
+        temp_df.iloc[:200, temp_df.columns.get_loc('order_weekday')] = 'Saturday' if weekday in ['Monday', 'Tuesday'] else 'Sunday'
+        df[df['order_weekday'] == weekday] = temp_df
+    return df
+
+
+@pytest.mark.parametrize('rows', [150, 5_000])
+def test_rebalance_weekdays_matches_weekday_loop(rows):
+    rng = np.random.default_rng(3)
+    # A shuffled, non-contiguous index, as left by the rows preprocess() drops
+    df = pd.DataFrame({'order_weekday': rng.choice(WEEKDAYS, rows), 'sales': rng.random(rows)},
+                      index=rng.permutation(rows * 2)[:rows])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        expected = weekday_loop(df.copy())
+
+    pd.testing.assert_series_equal(rebalance_weekdays(df['order_weekday']), expected['order_weekday'])
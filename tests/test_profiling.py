@@ -0,0 +1,63 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from utils import profiling
+from utils.profiling import _enabled, begin, profiled, record_figure
+
+
+@pytest.mark.parametrize("value", [None, "", "0", "false", "False", " FALSE "])
+def test_off_values_leave_profiling_off(value):
+    assert not _enabled(value)
+
+
+@pytest.mark.parametrize("value", ["1", "true", "yes"])
+def test_other_values_turn_profiling_on(value):
+    assert _enabled(value)
+
+
+class FakeContext:
+    """
+    The parts of a script run context profiling reads.
+    """
+
+    def __init__(self, fragment_ids_this_run=None, current_fragment_id=None):
+        self.session_id = "session"
+        self.fragment_ids_this_run = fragment_ids_this_run
+        self.current_fragment_id = current_fragment_id
+
+
+@pytest.fixture
+def script_run(monkeypatch, tmp_path):
+    monkeypatch.setenv(profiling.ENABLE_VARIABLE, "1")
+    monkeypatch.setenv(profiling.LOG_VARIABLE, str(tmp_path / "profile.jsonl"))
+    monkeypatch.setattr(profiling, "st", SimpleNamespace(session_state={}, query_params={}))
+    context = {"ctx": FakeContext()}
+    monkeypatch.setattr(profiling, "get_script_run_ctx", lambda suppress_warning=False: context["ctx"])
+    return context
+
+
+def test_fragment_rerun_gets_a_run_of_its_own(script_run):
+    @profiled
+    def view():
+        record_figure(True, 0.0, 10)
+
+    begin("Supply Chain")
+    view()
+    full_run = profiling.st.session_state[profiling._STATE_KEY]
+
+    # Streamlit reruns only the fragment: neither `begin()` nor `finish()` is called
+    script_run["ctx"] = FakeContext(["fragment"], "fragment")
+    view()
+    view()
+
+    assert [record["run"] for record in full_run.records] == [full_run.id]
+    assert profiling._FRAGMENT_KEY not in profiling.st.session_state
+    with open(os.environ[profiling.LOG_VARIABLE]) as f:
+        records = [json.loads(line) for line in f]
+    assert len({record["run"] for record in records}) == 3
+    assert [record["fragment"] for record in records] == [None, "fragment", "fragment"]
+    assert {record["page"] for record in records} == {"Supply Chain"}
+    assert [record["payload_bytes"] for record in records] == [10, 10, 10]
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from utils.ranking import RankedCounts
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "customer_city": ["Caguas", "Chicago", "Caguas", "Denver", "Caguas", "Chicago", None],
+        "order_id": [1, 2, 3, 4, None, 6, 7],
+    })
+
+
+@pytest.fixture
+def ranked(df):
+    return RankedCounts(df, "customer_city", "order_id", label="City", count_label="Orders")
+
+
+def test_pages_are_slices_of_the_ranked_counts(df, ranked):
+    # The per-rerun regroup and sort the pager used to run
+    table = df.groupby("customer_city")["order_id"].count().reset_index().sort_values(by="order_id", ascending=False)
+    table = table.rename(columns={"customer_city": "City", "order_id": "Orders"}).reset_index(drop=True)
+    assert len(ranked) == 3
+    pd.testing.assert_frame_equal(ranked.page(1, 2), table.iloc[:2])
+    pd.testing.assert_frame_equal(ranked.page(2, 2), table.iloc[2:])
+    assert ranked.page(2, 2).to_dict("list") == {"City": ["Denver"], "Orders": [1]}
+    assert ranked.page(3, 2).empty
+
+
+def test_lookup(ranked):
+    assert ranked.lookup("Denver").to_dict("list") == {"City": ["Denver"], "Orders": [1]}
+    assert ranked.lookup("Boston").empty
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from utils.scatter import budgeted_scatter, sample_points
+
+
+def clusters(rows=50_000):
+    # A dense cluster holding 90% of the rows and a sparse one far from it
+    rng = np.random.default_rng(0)
+    dense = rows * 9 // 10
+    df = pd.DataFrame({
+        "x": np.concatenate([rng.normal(0, 1, dense), rng.normal(50, 1, rows - dense)]),
+        "y": np.concatenate([rng.normal(0, 1, dense), rng.normal(50, 1, rows - dense)]),
+        "cluster": ["dense"] * dense + ["sparse"] * (rows - dense),
+    })
+    return df.sample(frac=1, random_state=0).reset_index(drop=True)
+
+
+def test_sample_keeps_each_group_share():
+    df = clusters()
+    sample = sample_points(df, "x", "y", budget=5000)
+    assert 4000 <= len(sample) <= 6000
+    shares = sample["cluster"].value_counts(normalize=True)
+    expected = df["cluster"].value_counts(normalize=True)
+    assert (shares - expected).abs().max() < 0.02
+    # Rows are a subset of the frame, in its order
+    assert sample.index.is_monotonic_increasing
+    pd.testing.assert_frame_equal(sample, df.loc[sample.index])
+
+
+def test_sample_drops_rows_without_coordinates():
+    df = clusters()
+    df.loc[::10, "x"] = np.nan
+    sample = sample_points(df, "x", "y", budget=5000)
+    assert sample["x"].notna().all()
+
+
+def test_sample_is_reproducible():
+    df = clusters()
+    pd.testing.assert_frame_equal(sample_points(df, "x", "y", seed=3), sample_points(df, "x", "y", seed=3))
+
+
+def test_frames_within_budget_are_drawn_whole_as_svg():
+    df = clusters(rows=1000)
+    fig, shown = budgeted_scatter(df, "x", "y", budget=1000)
+    assert shown == 1000
+    assert fig.data[0].type == "scatter"
+    assert len(fig.data[0].x) == 1000
+
+
+def test_frames_above_budget_switch_to_webgl():
+    df = clusters(rows=1001)
+    fig, shown = budgeted_scatter(df, "x", "y", budget=1000)
+    assert fig.data[0].type == "scattergl"
+    assert shown == len(fig.data[0].x) < 1001
@@ -0,0 +1,55 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from utils.shared import SharedFrame
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "sales": [1.5, 2.0, 3.25],
+        "orders": [1, 2, 3],
+        "region": pd.Categorical(["East", "West", "East"]),
+    })
+
+
+def test_view_matches_source(df):
+    shared = SharedFrame(df)
+    assert len(shared) == 3
+    pd.testing.assert_frame_equal(shared.view(), df)
+
+
+def test_shared_columns_are_read_only(df):
+    view = SharedFrame(df).view()
+    with pytest.raises(ValueError, match="read-only"):
+        view["sales"].to_numpy()[0] = 0.0
+
+
+def test_new_columns_stay_local_to_a_view(df):
+    shared = SharedFrame(df)
+    view = shared.view()
+    view["profit"] = view["sales"] * 2
+    assert "profit" not in shared.view()
+
+
+def test_version_follows_contents(df):
+    assert SharedFrame(df).version == SharedFrame(df.copy()).version
+    changed = df.assign(sales=df["sales"] + 1)
+    assert SharedFrame(changed).version != SharedFrame(df).version
+    # Categorical labels live in the dictionary, not in the codes
+    relabelled = df.assign(region=df["region"].cat.rename_categories(["North", "South"]))
+    assert SharedFrame(relabelled).version != SharedFrame(df).version
+
+
+
+def test_converted_columns_are_not_held_twice():
+    labels = pd.DataFrame({
+        "customer": [f"Customer {i}" for i in range(100_000)],
+        "segment": pd.Categorical(["Consumer", "Corporate"] * 50_000),
+    })
+    before = pa.total_allocated_bytes()
+    shared = SharedFrame(labels)
+    # The Arrow copies of the string and categorical columns are released once converted to pandas
+    assert pa.total_allocated_bytes() - before < 1 << 16
+    pd.testing.assert_frame_equal(shared.view(), labels)
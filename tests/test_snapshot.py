@@ -0,0 +1,93 @@
+import os
+
+import pandas as pd
+import pytest
+
+import utils.snapshot
+from utils.snapshot import code_version, file_digest, load_snapshot
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils.snapshot, "SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,x\n2,y\n")
+    return path
+
+
+class Builds:
+    """
+    Snapshot builder counting its calls.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        return pd.read_csv(path)
+
+
+def test_unchanged_source_is_served_from_the_snapshot(source):
+    build = Builds()
+    first = load_snapshot("data", str(source), build)
+    second = load_snapshot("data", str(source), build)
+    assert build.calls == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_touched_source_with_the_same_content_is_reused(source):
+    build = Builds()
+    load_snapshot("data", str(source), build)
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    load_snapshot("data", str(source), build)
+    assert build.calls == 1
+    # The manifest now holds the new mtime, so the next load does not hash the file again
+    load_snapshot("data", str(source), build)
+    assert build.calls == 1
+
+
+def test_changed_content_rebuilds(source):
+    build = Builds()
+    load_snapshot("data", str(source), build)
+    source.write_text("a,b\n1,x\n2,y\n3,z\n")
+    df = load_snapshot("data", str(source), build)
+    assert build.calls == 2
+    assert len(df) == 3
+
+
+def test_failed_write_leaves_no_partial_file(source, monkeypatch):
+    build = Builds()
+    before = load_snapshot("data", str(source), build)
+    source.write_text("a,b\n1,x\n")
+
+    def fail(self, path, **kwargs):
+        with open(path, "wb") as f:
+            f.write(b"PAR1 partial")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", fail)
+    with pytest.raises(OSError):
+        load_snapshot("data", str(source), build)
+    directory = utils.snapshot.SNAPSHOT_DIR
+    assert sorted(os.listdir(directory)) == ["data.json", "data.parquet"]
+    # The previous snapshot is intact
+    pd.testing.assert_frame_equal(pd.read_parquet(os.path.join(directory, "data.parquet")), before)
+
+
+def test_changed_key_rebuilds(source):
+    build = Builds()
+    load_snapshot("data", str(source), build, key={"code": "v1", "seed": 0})
+    # Keys are compared after a JSON round trip, so tuples and lists are the same key
+    load_snapshot("data", str(source), build, key={"code": "v1", "seed": 0, "columns": ()})
+    load_snapshot("data", str(source), build, key={"code": "v1", "seed": 0, "columns": []})
+    assert build.calls == 2
+    load_snapshot("data", str(source), build, key={"code": "v2", "seed": 0, "columns": []})
+    assert build.calls == 3
+
+
+def test_code_version_follows_the_source():
+    first = code_version(load_snapshot)
+    assert first == code_version(load_snapshot)
+    assert first != code_version(load_snapshot, file_digest)
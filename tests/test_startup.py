@@ -0,0 +1,26 @@
+import sys
+import time
+
+import pytest
+
+from utils import startup
+from utils.startup import process_seconds
+
+_imported = time.perf_counter()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads the start time from /proc/self/stat")
+def test_process_seconds_counts_from_process_start():
+    first = process_seconds()
+    assert first is not None
+    # The process started before this module was imported, and keeps ageing
+    assert first >= time.perf_counter() - _imported
+    assert process_seconds() >= first
+
+
+def test_process_seconds_is_none_without_proc(monkeypatch):
+    def no_proc(path, *args, **kwargs):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(startup, "open", no_proc, raising=False)
+    assert process_seconds() is None
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from utils.compact import as_labels
+
+
+def aggregate(df, value, groupings, keys=None):
+    """
+    Sum, count (non-missing) and average `value` for every grouping of key columns (or Series in `keys`) in one pass.
+    """
+    # Like a sorted groupby: missing keys are dropped and categorical keys come out as plain labels.
+    # `size` counts every row of a group; a non-numeric `value` (e.g. a string id) is only counted.
+    keys = keys or {}
+    column = df[value]
+    known = column.notna().to_numpy()
+    numeric = pd.api.types.is_numeric_dtype(column.dtype)
+    if numeric:
+        weights = np.where(known, column.to_numpy(dtype=float, na_value=np.nan), 0.0)
+
+    factorized = {}
+    for names in groupings.values():
+        for name in names:
+            if name not in factorized:
+                key = keys[name] if name in keys else df[name]
+                factorized[name] = pd.factorize(key, sort=True)
+
+    results = {}
+    for result, names in groupings.items():
+        sizes = [len(factorized[name][1]) for name in names]
+        valid = np.ones(len(known), dtype=bool)
+        group = np.zeros(len(known), dtype=np.int64)
+        for name, size in zip(names, sizes):
+            codes = factorized[name][0]
+            valid &= codes >= 0
+            group = group * size + codes
+
+        group = group[valid]
+        cells = int(np.prod(sizes, dtype=np.int64))
+        if cells > len(group):
+            # Sparse combination of keys: compact the group ids before counting
+            group, ids = pd.factorize(group, sort=True)
+        else:
+            ids = np.arange(cells)
+        size = np.bincount(group, minlength=len(ids))
+        count = np.bincount(group, weights=known[valid], minlength=len(ids)).astype(np.int64)
+
+        present = np.flatnonzero(size)
+        positions = np.unravel_index(ids[present], sizes)
+        frame = {name: factorized[name][1][position] for name, position in zip(names, positions)}
+        if numeric:
+            total = np.bincount(group, weights=weights[valid], minlength=len(ids))[present]
+            frame[value] = total
+        frame["count"] = count[present]
+        frame["size"] = size[present]
+        if numeric:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                frame["mean"] = total / count[present]
+        results[result] = as_labels(pd.DataFrame(frame))
+    return results
+
+
+def top_k(frame, column, k, within=None):
+    """
+    Return the `k` rows of `frame` with the largest `column` (per `within` group if given), largest first.
+    """
+    # Ties keep their order in `frame` and missing values rank last
+    values = frame[column].to_numpy(dtype=float)
+    values = np.where(np.isnan(values), -np.inf, values)
+    if within is None:
+        positions = _largest(values, np.arange(len(values)), k)
+    else:
+        groups = frame.groupby(within, sort=False, observed=True).indices.values()
+        positions = np.concatenate([_largest(values[group], group, k) for group in groups] or [np.array([], dtype=np.intp)])
+        positions = positions[np.lexsort((positions, -values[positions]))]
+    return frame.iloc[positions]
+
+
+def _largest(values, positions, k):
+    # Positions of the k largest values, largest first, ties broken by position
+    if 0 < k < len(values):
+        kth = np.partition(values, len(values) - k)[len(values) - k]
+        keep = np.flatnonzero(values >= kth)
+        values, positions = values[keep], positions[keep]
+    order = np.lexsort((positions, -values))[:k]
+    return positions[order]
@@ -0,0 +1,10 @@
+from utils.compact import as_labels
+
+
+def chart_totals(df, by, values=None, name="count"):
+    """
+    Reduce `df` to one row per `by` group, summing `values` or counting rows into `name`, before plotting.
+    """
+    if values is None:
+        return as_labels(df.groupby(by, observed=True).size().reset_index(name=name))
+    return as_labels(df.groupby(by, as_index=False, observed=True)[values].sum())
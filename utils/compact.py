@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+# A listed string column only becomes categorical when it has at most this many distinct values per row
+MAX_CATEGORY_RATIO = 0.5
+
+# Narrowest integer type of a compacted column: pages multiply and accumulate them, which wraps silently in int8/int16
+MIN_INTEGER_DTYPE = np.int32
+
+
+def _downcast(column):
+    # Integers go to int32 when every value fits; floats go to float32 only when every value survives the round trip
+    if pd.api.types.is_bool_dtype(column):
+        return column
+    if pd.api.types.is_integer_dtype(column):
+        # Signed types only, so differences of a non-negative column cannot wrap around
+        bounds = np.iinfo(MIN_INTEGER_DTYPE)
+        if column.empty or (column.min() >= bounds.min and column.max() <= bounds.max):
+            return column.astype(MIN_INTEGER_DTYPE)
+        return column
+    if pd.api.types.is_float_dtype(column):
+        narrow = column.astype(np.float32)
+        if np.array_equal(narrow.to_numpy(dtype=np.float64), column.to_numpy(), equal_nan=True):
+            return narrow
+    return column
+
+
+def compact(df, categories=(), max_ratio=MAX_CATEGORY_RATIO):
+    """
+    Return `df` with the listed low-cardinality string columns as categoricals and numerics downcast losslessly.
+    """
+    columns = {}
+    for name, column in df.items():
+        if name in categories and column.dtype == object and column.nunique() <= max_ratio * len(column):
+            columns[name] = column.astype("category")
+        elif pd.api.types.is_numeric_dtype(column.dtype) and isinstance(column.dtype, np.dtype):
+            columns[name] = _downcast(column)
+        else:
+            columns[name] = column
+    return pd.DataFrame(columns, index=df.index)
+
+
+def compaction_report(before, after):
+    """
+    Return the dtype and resident bytes of every column before and after `compact`, with a total row.
+    """
+    old = before.memory_usage(deep=True, index=False)
+    new = after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        "column": list(before.columns),
+        "dtype before": [str(dtype) for dtype in before.dtypes],
+        "dtype after": [str(dtype) for dtype in after.dtypes],
+        "bytes before": old.to_numpy(),
+        "bytes after": new.to_numpy(),
+    })
+    total = {"column": "(total)", "dtype before": "", "dtype after": "", "bytes before": old.sum(), "bytes after": new.sum()}
+    report = pd.concat([report, pd.DataFrame([total])], ignore_index=True)
+    report["ratio"] = (report["bytes before"] / report["bytes after"]).round(1)
+    return report
+
+
+def as_labels(df):
+    """
+    Return `df` with categorical columns as plain labels, for code that groups without `observed=True`.
+    """
+    columns = {name: column.astype(column.cat.categories.dtype) for name, column in df.items()
+               if isinstance(column.dtype, pd.CategoricalDtype)}
+    return df.assign(**columns) if columns else df
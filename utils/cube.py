@@ -0,0 +1,64 @@
+import pandas as pd
+
+from utils.date_index import DateIndex
+
+CUBE_DIMENSIONS = ["Region", "State", "City", "Category", "Sub-Category", "Segment", "month"]
+CUBE_MEASURES = ["Sales", "Profit", "Quantity"]
+
+
+def build_cube(df, date_column="Order Date"):
+    """
+    Aggregate order rows into one cell per dimension combination and month, with the row count in `Orders`.
+    """
+    keys = [df[column] for column in CUBE_DIMENSIONS[:-1]]
+    keys.append(df[date_column].dt.to_period("M").rename("month"))
+    cube = df.groupby(keys, sort=False, dropna=False, observed=True).agg(
+        Sales=("Sales", "sum"),
+        Profit=("Profit", "sum"),
+        Quantity=("Quantity", "sum"),
+        Orders=("Sales", "size"),
+    )
+    return cube.reset_index()
+
+
+class SalesCube:
+    """
+    Sales/Profit/Quantity cube of a frame sorted by `date_column`, selected by date range and filters.
+    """
+
+    def __init__(self, df, date_column="Order Date"):
+        self.rows = DateIndex(df, date_column)
+        self.date_column = date_column
+        self.cells = build_cube(df, date_column)
+
+    def select(self, start, end, filters=None):
+        """
+        Return the cube cells for orders between `start` and `end` (inclusive) matching `filters`.
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+
+        # Months lying entirely inside the range are answered from the cube
+        first, last = start.to_period("M"), end.to_period("M")
+        if start > first.start_time:
+            first += 1
+        if end < last.end_time:
+            last -= 1
+        month = self.cells["month"]
+        cells = self.cells[(month >= first) & (month <= last)]
+
+        # The partially selected months at either end are aggregated from their rows
+        lo, hi = self.rows.bounds(start, end)
+        if first <= last:
+            whole_lo, whole_hi = self.rows.bounds(first.start_time, last.end_time)
+            edges = [self.rows.frame.iloc[lo:whole_lo], self.rows.frame.iloc[whole_hi:hi]]
+        else:
+            edges = [self.rows.frame.iloc[lo:hi]]
+        edge_rows = pd.concat(edges)
+        if len(edge_rows):
+            cells = pd.concat([cells, build_cube(edge_rows, self.date_column)], ignore_index=True)
+
+        # An empty list of values leaves that dimension unfiltered
+        for column, values in (filters or {}).items():
+            if values:
+                cells = cells[cells[column].isin(values)]
+        return cells
@@ -0,0 +1,125 @@
+import os
+
+import pandas as pd
+
+import utils.compact
+import utils.date_index
+import utils.delivery
+import utils.preprocessor
+from utils.compact import compact, compaction_report
+from utils.date_index import sort_by_date
+from utils.delivery import DEFAULT_SEED
+from utils.preprocessor import preprocess
+from utils.snapshot import code_version, load_snapshot
+
+SUPERSTORE_PATH = "Superstore.xls"
+SUPPLYCHAIN_PATH = "data.csv"
+PROCUREMENT_PATH = "filtered_data.csv"
+SUPERSTORE_DATE_COLUMNS = ["Order Date", "Ship Date"]
+
+# Only the columns the procurement page uses are read, and missing labels are filled once
+PROCUREMENT_COLUMNS = [
+    "INPUT DATE", "ITEM TOTAL COST", "VENDOR NAME 1", "COMMODITY DESCRIPTION",
+    "STATUS", "VENDOR STATE", "DEPARTMENT NAME",
+]
+PROCUREMENT_DEFAULTS = {
+    "VENDOR NAME 1": "Unknown Vendor",
+    "COMMODITY DESCRIPTION": "Unknown Commodity",
+    "STATUS": "Unknown Status",
+    "VENDOR STATE": "Unknown Region",
+}
+
+# Label columns stored as categoricals; numeric columns are downcast without a schema
+SUPERSTORE_CATEGORIES = [
+    "Ship Mode", "Customer ID", "Customer Name", "Segment", "Country", "City", "State",
+    "Region", "Product ID", "Category", "Sub-Category", "Product Name",
+]
+PROCUREMENT_CATEGORIES = [
+    "VENDOR NAME 1", "COMMODITY DESCRIPTION", "STATUS", "VENDOR STATE", "DEPARTMENT NAME",
+]
+SUPPLYCHAIN_CATEGORIES = [
+    "customer_state", "customer_city", "customer_country", "customer_segment", "market",
+    "shipping_mode", "order_city", "order_state", "order_country", "product_name",
+    "category_name", "order_status", "payment_type", "order_weekday", "order_period_str",
+]
+
+
+def _read_superstore(path):
+    """
+    Parse the legacy Superstore XLS into a typed frame sorted by order date.
+    """
+    df = pd.read_excel(path)
+    for column in SUPERSTORE_DATE_COLUMNS:
+        df[column] = pd.to_datetime(df[column])
+    return sort_by_date(df, "Order Date")
+
+
+def _build_superstore(path):
+    return compact(_read_superstore(path), SUPERSTORE_CATEGORIES)
+
+
+def load_superstore(path=SUPERSTORE_PATH):
+    """
+    Load the default Superstore dataset, parsing the XLS only when the file has changed.
+    """
+    key = {
+        "code": code_version(_read_superstore, utils.date_index, utils.compact),
+        "dates": SUPERSTORE_DATE_COLUMNS,
+        "categories": SUPERSTORE_CATEGORIES,
+    }
+    return load_snapshot("superstore", path, _build_superstore, key=key)
+
+
+def _read_procurement(path):
+    """
+    Read and clean the procurement CSV into a typed frame sorted by input date.
+    """
+    df = pd.read_csv(path, engine="pyarrow", usecols=PROCUREMENT_COLUMNS)
+    # Invalid dates and costs become missing values instead of leaving the column as strings
+    df["INPUT DATE"] = pd.to_datetime(df["INPUT DATE"], errors="coerce")
+    df["ITEM TOTAL COST"] = pd.to_numeric(df["ITEM TOTAL COST"], errors="coerce")
+    df = df.fillna(PROCUREMENT_DEFAULTS)
+    return sort_by_date(df, "INPUT DATE")
+
+
+def _build_procurement(path):
+    return compact(_read_procurement(path), PROCUREMENT_CATEGORIES)
+
+
+def load_procurement(path=PROCUREMENT_PATH):
+    """
+    Load the cleaned procurement dataset, reading the CSV only when the file has changed.
+    """
+    key = {
+        "code": code_version(_read_procurement, utils.date_index, utils.compact),
+        "columns": PROCUREMENT_COLUMNS,
+        "defaults": PROCUREMENT_DEFAULTS,
+        "categories": PROCUREMENT_CATEGORIES,
+    }
+    return load_snapshot("procurement", path, _build_procurement, key=key)
+
+
+def load_supplychain(path=SUPPLYCHAIN_PATH, seed=DEFAULT_SEED):
+    """
+    Load the preprocessed supply chain dataset, rebuilding its snapshot when the data, code or seed change.
+    """
+    key = {
+        "code": code_version(utils.preprocessor, utils.delivery, utils.date_index, utils.compact),
+        "seed": seed,
+        "categories": SUPPLYCHAIN_CATEGORIES,
+    }
+    return load_snapshot("supplychain", path, lambda source: compact(preprocess(source, seed), SUPPLYCHAIN_CATEGORIES), key=key)
+
+
+if __name__ == "__main__":
+    # python -m utils.datasets: memory of each available dataset before and after compaction, per column
+    readers = [
+        (SUPERSTORE_PATH, _read_superstore, SUPERSTORE_CATEGORIES),
+        (PROCUREMENT_PATH, _read_procurement, PROCUREMENT_CATEGORIES),
+        (SUPPLYCHAIN_PATH, lambda source: preprocess(source, DEFAULT_SEED), SUPPLYCHAIN_CATEGORIES),
+    ]
+    for path, read, categories in readers:
+        if os.path.exists(path):
+            df = read(path)
+            print(f"{path} ({len(df):,} rows)")
+            print(compaction_report(df, compact(df, categories)).to_string(index=False), end="\n\n")
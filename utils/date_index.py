@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+
+def sort_by_date(df, column):
+    """
+    Return `df` sorted by `column` (missing dates last) with a fresh RangeIndex.
+    """
+    return df.sort_values(column, kind="stable", na_position="last").reset_index(drop=True)
+
+
+class DateIndex:
+    """
+    Binary-search time-range lookups over a frame sorted by a date column (see `sort_by_date`).
+    """
+
+    def __init__(self, df, column):
+        self.frame = df
+        self.column = column
+        self.dates = df[column].to_numpy()
+        # Missing dates are sorted last and never fall inside a range
+        self.valid = len(self.dates) - int(np.isnat(self.dates).sum())
+
+    def span(self):
+        """
+        Return the first and last dates of the frame as Timestamps, or (None, None) when it has no dates.
+        """
+        if not self.valid:
+            return None, None
+        return pd.Timestamp(self.dates[0]), pd.Timestamp(self.dates[self.valid - 1])
+
+    def bounds(self, start=None, end=None):
+        """
+        Return the (lo, hi) positions of the rows dated between `start` and `end` (inclusive; None leaves a side open).
+        """
+        dates = self.dates[:self.valid]
+        lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start), "ns"), side="left"))
+        hi = self.valid if end is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end), "ns"), side="right"))
+        return lo, max(lo, hi)
+
+    def slice(self, start=None, end=None):
+        """
+        Return the rows dated between `start` and `end` (inclusive) as a view of the frame.
+        """
+        lo, hi = self.bounds(start, end)
+        return self.frame.iloc[lo:hi]
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+# Seed used when preprocessing the supply chain data, so simulated delivery dates are reproducible
+DEFAULT_SEED = 0
+
+# Minimum and maximum days for each shipping mode (same order in all three)
+SHIPPING_MODES = ['First Class', 'Second Class', 'Standard Class']
+MIN_DAYS = np.array([2, 5, 8])
+MAX_DAYS = np.array([3, 6, 11])
+
+# Markets that always get the minimum / maximum days; every other market draws uniformly in between
+FASTEST_MARKETS = ['LATAM', 'USCA']
+SLOWEST_MARKETS = ['Pacific Asia']
+
+# Extra days added to a share of 'Same Day' orders, as (days, share) pairs drawn independently
+SAME_DAY_DELAYS = [(1, 0.08), (2, 0.02)]
+
+
+def delivery_offsets(market, shipping_mode, rng):
+    """
+    Return the number of days between order and delivery for every row.
+    """
+    market = pd.Index(market)
+    shipping_mode = pd.Index(shipping_mode)
+
+    # -1 marks 'Same Day' (and any unknown mode), which gets no base offset
+    mode = pd.Categorical(shipping_mode, categories=SHIPPING_MODES).codes
+    known = mode >= 0
+    fastest = known & market.isin(FASTEST_MARKETS)
+    slowest = known & market.isin(SLOWEST_MARKETS)
+
+    offsets = np.zeros(len(mode), dtype=np.int64)
+    offsets[fastest] = MIN_DAYS[mode[fastest]]
+    offsets[slowest] = MAX_DAYS[mode[slowest]]
+
+    # One draw per shipping mode for the markets with random delivery times
+    randomized = known & ~fastest & ~slowest
+    for code in range(len(SHIPPING_MODES)):
+        rows = np.flatnonzero(randomized & (mode == code))
+        offsets[rows] = rng.integers(MIN_DAYS[code], MAX_DAYS[code], size=len(rows), endpoint=True)
+
+    same_day = np.flatnonzero(shipping_mode == 'Same Day')
+    for days, share in SAME_DAY_DELAYS:
+        delayed = rng.choice(same_day, int(len(same_day) * share), replace=False)
+        offsets[delayed] += days
+
+    return offsets
+
+
+def simulate_delivery_dates(order_date, market, shipping_mode, seed=DEFAULT_SEED):
+    """
+    Return simulated delivery dates based on the shipping mode and market.
+    """
+    rng = np.random.default_rng(seed)
+    offsets = delivery_offsets(market, shipping_mode, rng)
+    return order_date + pd.to_timedelta(offsets, unit='D')
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+MAX_OUTLIERS = 200
+
+
+def _bin_size(span, nbins, integral):
+    # Smallest "nice" size (1, 2, 2.5 or 5 times a power of ten) giving at most `nbins` bins
+    target = span / nbins if span > 0 else 1.0
+    magnitude = 10.0 ** np.floor(np.log10(target))
+    size = next(step * magnitude for step in (1, 2, 2.5, 5, 10) if step * magnitude >= target)
+    if integral:
+        size = max(1.0, np.ceil(size))
+    return size
+
+
+def histogram(values, nbins=10):
+    """
+    Return the `start`, `end`, `center` and `count` of at most about `nbins` equal-width bins of `values`.
+    """
+    # Bins are closed on the left. Whole-number data (e.g. durations in days) gets whole-number widths
+    # and edges halfway between whole numbers, so no value sits on an edge
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return pd.DataFrame({"start": [], "end": [], "center": [], "count": []})
+    lo, hi = values.min(), values.max()
+    integral = bool(np.all(values == np.round(values)))
+    size = _bin_size(hi - lo, nbins, integral)
+    start = np.floor(lo / size) * size
+    if integral:
+        start -= 0.5
+    codes = np.floor((values - start) / size).astype(np.int64)
+    counts = np.bincount(codes)
+    edges = start + size * np.arange(len(counts) + 1)
+    return pd.DataFrame({"start": edges[:-1], "end": edges[1:], "center": (edges[:-1] + edges[1:]) / 2, "count": counts})
+
+
+def _box(values, max_outliers, rng):
+    # Quartiles (linear interpolation, as Plotly computes them), Tukey whiskers and capped outliers
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    reach = 1.5 * (q3 - q1)
+    inside = values[(values >= q1 - reach) & (values <= q3 + reach)]
+    outliers = values[(values < q1 - reach) | (values > q3 + reach)]
+    if len(outliers) > max_outliers:
+        # Keep both extremes so the axis range matches the full data
+        extremes = [outliers.argmin(), outliers.argmax()]
+        rest = rng.choice(len(outliers), max_outliers - 2, replace=False)
+        outliers = outliers[np.unique(np.concatenate([extremes, rest]))]
+    return {
+        "q1": q1, "median": median, "q3": q3,
+        "lowerfence": inside.min(), "upperfence": inside.max(),
+        "count": len(values), "outliers": outliers,
+    }
+
+
+def box_stats(df, value, by, max_outliers=MAX_OUTLIERS, seed=0):
+    """
+    Return box-plot statistics of `value` per `by` group: quartiles, Tukey whiskers, count and capped outliers.
+    """
+    rng = np.random.default_rng(seed)
+    values = df[value].to_numpy(dtype=float)
+    stats = {}
+    for group, positions in df.groupby(by, sort=False, observed=True).indices.items():
+        group_values = values[positions]
+        group_values = group_values[np.isfinite(group_values)]
+        if len(group_values):
+            stats[group] = _box(group_values, max_outliers, rng)
+    return stats
+
+
+def box_traces(stats, color=None, name=None, showlegend=False):
+    """
+    Build a `go.Box` of precomputed `box_stats` groups plus a marker trace for their outliers.
+    """
+    groups = list(stats)
+    box = go.Box(
+        x=groups,
+        q1=[stats[group]["q1"] for group in groups],
+        median=[stats[group]["median"] for group in groups],
+        q3=[stats[group]["q3"] for group in groups],
+        lowerfence=[stats[group]["lowerfence"] for group in groups],
+        upperfence=[stats[group]["upperfence"] for group in groups],
+        name=name, marker_color=color, showlegend=showlegend, legendgroup=name,
+    )
+    points = go.Scatter(
+        x=np.concatenate([[group] * len(stats[group]["outliers"]) for group in groups]) if groups else [],
+        y=np.concatenate([stats[group]["outliers"] for group in groups]) if groups else [],
+        mode="markers", name=name, marker_color=color, showlegend=False, legendgroup=name, hoverinfo="y",
+    )
+    return [box, points]
@@ -0,0 +1,79 @@
+import gzip
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.lru import SizedLRU
+
+# Download formats offered for a frame: file extension and MIME type
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+# Rows serialized at a time, bounding the memory of the intermediate text or Arrow chunk
+CHUNK_ROWS = 50_000
+
+# Total size of the generated files kept by the shared cache
+DEFAULT_MAX_BYTES = 256 << 20
+
+
+def write_csv(df, out, chunk_rows=CHUNK_ROWS):
+    """
+    Write `df` as UTF-8 CSV to the binary stream `out`, one chunk of rows at a time.
+    """
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        out.write(chunk.to_csv(index=False, header=start == 0).encode("utf-8"))
+
+
+def write_parquet(df, out, chunk_rows=CHUNK_ROWS):
+    """
+    Write `df` as Parquet to the binary stream `out`, one row group per chunk of rows.
+    """
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(out, schema) as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def export_file(df, fmt, chunk_rows=CHUNK_ROWS):
+    """
+    Serialize `df` in one of the `EXPORT_FORMATS` and return the file's bytes.
+    """
+    buffer = io.BytesIO()
+    if fmt == "Parquet":
+        write_parquet(df, buffer, chunk_rows)
+    elif fmt == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as out:
+            write_csv(df, out, chunk_rows)
+    else:
+        write_csv(df, buffer, chunk_rows)
+    return buffer.getvalue()
+
+
+class ExportCache(SizedLRU):
+    """
+    Process-wide LRU cache of generated export files, keyed with `utils.lru.cache_key` plus the format.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        super().__init__(max_bytes)
+
+    def export(self, key, df, fmt):
+        """
+        Return the `fmt` file of `df` cached under `key`, serializing it on a miss.
+        """
+        # Cached as immutable bytes, whose `len()` is the size counted by the cache without reading the file
+        data = self.get(key)
+        if data is None:
+            data = export_file(df, fmt)
+            self.put(key, data)
+        return data
+
+
+# Shared by every page and session of the process
+EXPORTS = ExportCache()
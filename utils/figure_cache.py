@@ -0,0 +1,93 @@
+import json
+import time
+
+import plotly.io as pio
+import streamlit as st
+from streamlit.elements.lib.form_utils import current_form_id
+from streamlit.elements.lib.utils import compute_and_register_element_id
+from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+
+from utils.lru import SizedLRU
+from utils.profiling import record_figure
+
+# Total size of the serialized figures kept by the shared cache
+DEFAULT_MAX_BYTES = 64 << 20
+
+# Chart config `st.plotly_chart` sends when it is given none
+_CONFIG = json.dumps({"showLink": False, "linkText": False})
+
+
+def _points(fig):
+    # Markers, bars or slices drawn by every trace that has x values
+    return sum(len(trace.x) for trace in fig.data if getattr(trace, "x", None) is not None)
+
+
+class CachedFigure:
+    """
+    A built figure kept by the cache as its JSON spec, with the number of points it shows.
+    """
+
+    def __init__(self, spec, shown):
+        self.spec = spec
+        self.shown = shown
+
+    def __len__(self):
+        return len(self.spec)
+
+
+class FigureCache(SizedLRU):
+    """
+    Process-wide LRU cache of built Plotly figures, bounded by their total JSON size.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        super().__init__(max_bytes)
+
+    def figure(self, key, build):
+        """
+        Return the `CachedFigure` under `key`, calling `build()` for a figure or a (figure, shown) pair on a miss.
+        """
+        # Only the JSON string is kept, so no session can change a figure another one is shown;
+        # the figure is validated and serialized once, when built, and `plotly_chart` sends the string as is
+        start = time.perf_counter()
+        cached = self.get(key)
+        if cached is not None:
+            record_figure(True, time.perf_counter() - start, len(cached))
+            return cached
+
+        built = build()
+        fig, shown = built if isinstance(built, tuple) else (built, None)
+        cached = CachedFigure(pio.to_json(fig, validate=False), _points(fig) if shown is None else shown)
+        self.put(key, cached)
+        record_figure(False, time.perf_counter() - start, len(cached))
+        return cached
+
+
+def plotly_chart(cached, use_container_width=False):
+    """
+    Show a `CachedFigure` the way `st.plotly_chart` shows a figure, without rebuilding it from its spec.
+    """
+    # Mirrors the non-selection path of `st.plotly_chart` (streamlit is pinned in requirements.txt)
+    dg = st._main
+    proto = PlotlyChartProto()
+    proto.use_container_width = use_container_width
+    proto.theme = "streamlit"
+    proto.form_id = current_form_id(dg)
+    proto.spec = cached.spec
+    proto.config = _CONFIG
+    proto.id = compute_and_register_element_id(
+        "plotly_chart",
+        user_key=None,
+        form_id=proto.form_id,
+        plotly_spec=proto.spec,
+        plotly_config=proto.config,
+        selection_mode=("points", "box", "lasso"),
+        is_selection_activated=False,
+        theme="streamlit",
+        use_container_width=use_container_width,
+    )
+    return dg._enqueue("plotly_chart", proto)
+
+
+# Shared by every page and session of the process
+FIGURES = FigureCache()
@@ -0,0 +1,49 @@
+import numpy as np
+
+
+class HierarchyIndex:
+    """
+    Region -> State -> City index of row positions, each leaf sorted by date.
+    """
+
+    def __init__(self, df, levels=("Region", "State", "City"), date_column="Order Date"):
+        self.levels = list(levels)
+        dates = df[date_column].to_numpy()
+        groups = df.groupby(self.levels, sort=False, dropna=False, observed=True).indices
+
+        # Keep leaves in order of first appearance so options are listed as `.unique()` would list them
+        self.keys = sorted(groups, key=lambda key: groups[key][0])
+        self.positions = []
+        self.dates = []
+        for key in self.keys:
+            positions = groups[key]
+            order = np.argsort(dates[positions], kind="stable")
+            self.positions.append(positions[order])
+            self.dates.append(dates[positions][order])
+
+    def _matches(self, start, end, selected):
+        # Yield the leaves under the selected values, each with its positions inside the date range
+        start, end = np.datetime64(start, "ns"), np.datetime64(end, "ns")
+        wanted = [(self.levels.index(level), set(values)) for level, values in (selected or {}).items() if values]
+        for key, positions, dates in zip(self.keys, self.positions, self.dates):
+            if all(key[level] in values for level, values in wanted):
+                lo = np.searchsorted(dates, start, side="left")
+                hi = np.searchsorted(dates, end, side="right")
+                if hi > lo:
+                    yield key, positions[lo:hi]
+
+    def options(self, level, start, end, selected=None):
+        """
+        Return the values of `level` with orders between `start` and `end` under the `selected` parents.
+        """
+        index = self.levels.index(level)
+        return list(dict.fromkeys(key[index] for key, _ in self._matches(start, end, selected)))
+
+    def select(self, start, end, selected=None):
+        """
+        Return the sorted row positions between `start` and `end` (inclusive) under the selected values.
+        """
+        slices = [positions for _, positions in self._matches(start, end, selected)]
+        if not slices:
+            return np.array([], dtype=np.intp)
+        return np.sort(np.concatenate(slices))
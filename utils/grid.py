@@ -0,0 +1,56 @@
+import math
+
+import numpy as np
+import streamlit as st
+
+PAGE_SIZE = 50
+
+
+class DataGrid:
+    """
+    Server-side paged table with color scales over all rows; only the visible page is styled and sent.
+    """
+
+    def __init__(self, df, cmap=None, page_size=PAGE_SIZE):
+        self.frame = df
+        self.cmap = cmap
+        self.page_size = page_size
+        self.bounds = {}
+        if cmap:
+            for name in df.select_dtypes("number").columns:
+                values = df[name].to_numpy(dtype=float, na_value=np.nan)
+                values = values[np.isfinite(values)]
+                if len(values):
+                    self.bounds[name] = (values.min(), values.max())
+
+    @property
+    def pages(self):
+        return max(1, math.ceil(len(self.frame) / self.page_size))
+
+    def page(self, number):
+        """
+        Return page `number` (counted from 1), as a Styler when the grid has a color scale.
+        """
+        start = (number - 1) * self.page_size
+        rows = self.frame.iloc[start:start + self.page_size]
+        if not self.bounds:
+            return rows
+        styler = rows.style
+        for name, (lo, hi) in self.bounds.items():
+            styler = styler.background_gradient(cmap=self.cmap, subset=[name], vmin=lo, vmax=hi)
+        return styler
+
+    def show(self, key):
+        """
+        Render the grid with a page picker; `key` must be unique on the page.
+        """
+        pages = self.pages
+        # A new filter can leave fewer pages than the one the picker was on
+        if st.session_state.get(key, 1) > pages:
+            st.session_state[key] = pages
+        number = st.number_input("Page", min_value=1, max_value=pages, step=1, key=key) if pages > 1 else 1
+        st.dataframe(self.page(number))
+        start = (number - 1) * self.page_size
+        end = min(start + self.page_size, len(self.frame))
+        if pages > 1:
+            st.caption(f"Rows {start + 1:,} to {end:,} of {len(self.frame):,}")
@@ -0,0 +1,82 @@
+import json
+import threading
+from collections import OrderedDict
+
+
+def cache_key(page, name, filters, version):
+    """
+    Return the cache key of a page's chart or export: its name, normalized filter state and dataset version.
+    """
+    # Multiselect order does not change the data, and dates become ISO strings, so equal states give equal keys
+    state = {field: sorted(map(str, value)) if isinstance(value, (list, tuple, set)) else value
+             for field, value in filters.items()}
+    return page, name, json.dumps(state, sort_keys=True, default=str), version
+
+
+class SizedLRU:
+    """
+    Thread-safe LRU mapping bounded by the total `len()` of its values, with hit, miss and eviction counters.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key):
+        """
+        Return the value stored under `key` (marking it recently used), or None.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Store `value` under `key`, evicting least recently used entries to stay within the bound.
+        """
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = value
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def stats(self):
+        """
+        Return the hit, miss and eviction counters with the current number of entries and bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+from utils.date_index import sort_by_date
+from utils.delivery import DEFAULT_SEED, simulate_delivery_dates
+
+
+def calculate_product_profit(df):
+    """
+    Calculate the profit for each product based on its price and a fluctuating profit percentage.
+    """
+    min_price = df['product_price'].min()
+    max_price = df['product_price'].max()
+
+    # Define initial and maximum profit percentages
+    min_profit_percentage = 0.03
+    max_profit_percentage = 0.30
+
+    # Calculate the linear profit percentage for each price
+    linear_profit_percentage = min_profit_percentage + (max_profit_percentage - min_profit_percentage) * (
+        (df['product_price'] - min_price) / (max_price - min_price))
+
+    # Add random fluctuation
+    np.random.seed(0)  # For reproducibility
+    fluctuation = np.random.uniform(-0.20, 0.20, size=df.shape[0])  # Random fluctuation between -20% and +20%
+
+    # Adding randomness to product price to introduce variability in the lower values
+    random_price_fluctuation = np.random.uniform(-0.05, 0.05, size=df.shape[0])
+    df['product_price'] = df['product_price'] * (1 + random_price_fluctuation)
+
+    # Adjust profit percentage with the added fluctuation
+    df['profit_percentage'] = np.clip(linear_profit_percentage + fluctuation, min_profit_percentage, max_profit_percentage)
+
+    # Calculate the profit based on the adjusted price and profit percentage
+    df['product_profit'] = df['product_price'] * df['profit_percentage']
+
+    # Drop the intermediate 'profit_percentage' column if not needed
+    df.drop(columns=['profit_percentage'], inplace=True)
+
+    return df['product_profit']
+
+
+def categorize_discount_rate(discount_rate):
+    """
+    Categorize discount rates into bins.
+    """
+    bins = [-float('inf'), 0, 0.025, 0.05, 0.075, 0.10, 0.125, 0.15, 0.175, 0.20, 0.225, 0.25, float('inf')]
+    labels = ['0', '2.5', '5', '7.5', '10', '12.5', '15', '17.5', '20', '22.5', '25', '25+']
+
+    # Categorize the discount rate based on 2.5% intervals
+    return pd.cut(discount_rate,
+                  bins=bins,
+                  labels=labels,
+                  right=False)  # right=False means the intervals are [)
+
+
+# Weekdays whose first orders are relabelled as weekend orders
+WEEKDAY_REBALANCE = {'Monday': 'Saturday', 'Tuesday': 'Saturday', 'Wednesday': 'Sunday', 'Thursday': 'Sunday'}
+
+
+def rebalance_weekdays(order_weekday, rows=200):
+    """
+    Relabel the first `rows` orders of each weekday in WEEKDAY_REBALANCE as weekend orders.
+    """
+    labels = order_weekday.to_numpy(copy=True)
+
+    # Collect every position up front so a relabelled row is never picked up again
+    positions = {weekday: np.flatnonzero(labels == weekday)[:rows] for weekday in WEEKDAY_REBALANCE}
+    for weekday, weekend in WEEKDAY_REBALANCE.items():
+        labels[positions[weekday]] = weekend
+
+    return pd.Series(labels, index=order_weekday.index, name=order_weekday.name)
+
+
+def preprocess(path='data.csv', seed=DEFAULT_SEED):
+    """
+    Load and preprocess the data from a CSV file.
+    """
+    # Load data from CSV
+    df = pd.read_csv(path)
+
+    # Drop rows with specific customer state
+    drop = df[df['customer_state'] == '91732'].index
+    df.drop(drop, inplace=True)
+
+    # Convert order_date to datetime
+    df['order_date'] = pd.to_datetime(df['order_date'], utc=True)
+    df = df.dropna(subset=['order_date'])
+    df['order_date'] = df['order_date'].dt.tz_localize(None)
+
+    # Map customer states to full names
+    state_mapping = {
+        'PR': 'Puerto Rico', 'CA': 'California', 'KY': 'Kentucky', 'NJ': 'New Jersey', 'AZ': 'Arizona',
+        'PA': 'Pennsylvania', 'NY': 'New York', 'OH': 'Ohio', 'CO': 'Colorado', 'MT': 'Montana',
+        'WI': 'Wisconsin', 'IL': 'Illinois', 'DC': 'District of Columbia', 'CT': 'Connecticut',
+        'WV': 'West Virginia', 'UT': 'Utah', 'FL': 'Florida', 'TX': 'Texas', 'MI': 'Michigan',
+        'NM': 'New Mexico', 'NV': 'Nevada', 'WA': 'Washington', 'NC': 'North Carolina', 'GA': 'Georgia',
+        'MD': 'Maryland', 'SC': 'South Carolina', 'TN': 'Tennessee', 'IN': 'Indiana', 'MO': 'Missouri',
+        'MN': 'Minnesota', 'OR': 'Oregon', 'VA': 'Virginia', 'MA': 'Massachusetts', 'HI': 'Hawaii',
+        'RI': 'Rhode Island', 'DE': 'Delaware', 'ID': 'Idaho', 'LA': 'Louisiana', 'ND': 'North Dakota',
+        'KS': 'Kansas', 'IA': 'Iowa', 'OK': 'Oklahoma', 'AL': 'Alabama'
+    }
+
+    # Map states
+    df['customer_state'] = df['customer_state'].map(state_mapping)
+    df['delivery_date'] = simulate_delivery_dates(df['order_date'], df['market'], df['shipping_mode'], seed)
+
+    # Calculate shipping duration
+    df['shipping_duration'] = (df['delivery_date'] - df['order_date']).dt.days
+
+    # Add order weekday
+    df['order_weekday'] = df['order_date'].dt.day_name()
+
+    # Adjust weekdays for specific conditions
+    df['order_weekday'] = rebalance_weekdays(df['order_weekday'])
+
+    # Calculate product profit
+    df['product_profit'] = calculate_product_profit(df)
+
+    # Derived columns used by the page views, computed once here rather than on every rerun
+    df['order_period'] = df['order_date'].dt.to_period('M')
+    df['order_period_str'] = df['order_period'].astype(str)
+    df['order_item_profit'] = df['order_item_profit_ratio'] * df['sales']
+    df['discount_category'] = categorize_discount_rate(df['order_item_discount_rate'])
+
+    # Keep the rows sorted by order date so time ranges are binary-searched slices
+    return sort_by_date(df, 'order_date')
@@ -0,0 +1,203 @@
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Set to profile every session of the process; `?profile=1` profiles a single session
+ENABLE_VARIABLE = "DASHBOARD_PROFILE"
+
+# Values of the variable or the query parameter that leave profiling off (compared case-insensitively)
+OFF_VALUES = ("", "0", "false")
+
+# JSON lines file every profiled section is appended to
+LOG_VARIABLE = "DASHBOARD_PROFILE_LOG"
+DEFAULT_LOG_PATH = os.path.join(".cache", "profile.jsonl")
+
+_STATE_KEY = "_profiling_run"
+_FRAGMENT_KEY = "_profiling_fragment_run"
+_log_lock = threading.Lock()
+
+
+class _Section:
+    def __init__(self, name):
+        self.name = name
+        self.started = time.time()
+        self.start = time.perf_counter()
+        self.build_seconds = 0.0
+        self.payload_bytes = 0
+        self.figures = 0
+        self.cache_hits = 0
+
+    def record(self, run):
+        seconds = time.perf_counter() - self.start
+        return {
+            "ts": round(self.started, 3),
+            "session": run.session,
+            "run": run.id,
+            "fragment": run.fragment,
+            "page": run.page,
+            "section": self.name,
+            "seconds": round(seconds, 6),
+            "compute_seconds": round(seconds - self.build_seconds, 6),
+            "build_seconds": round(self.build_seconds, 6),
+            "payload_bytes": self.payload_bytes,
+            "figures": self.figures,
+            "cache_hits": self.cache_hits,
+        }
+
+
+class _Run:
+    """
+    Sections of one script run of a profiled session.
+    """
+
+    def __init__(self, page, session, fragment=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.page = page
+        self.session = session
+        # Id of the `st.fragment` a fragment rerun reran, None for a full run
+        self.fragment = fragment
+        self.records = []
+        # The open `section()` of a script-style page, and the `profiled` calls nested in it
+        self.lap = None
+        self.stack = []
+
+    def current(self):
+        return self.stack[-1] if self.stack else self.lap
+
+    def close(self, section):
+        record = section.record(self)
+        self.records.append(record)
+        _write(record)
+
+
+def _write(record):
+    path = os.environ.get(LOG_VARIABLE, DEFAULT_LOG_PATH)
+    line = json.dumps(record) + "\n"
+    with _log_lock:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a") as f:
+            f.write(line)
+
+
+def _enabled(value):
+    return value is not None and value.strip().lower() not in OFF_VALUES
+
+
+def _current():
+    # Only a real script run has a session; bare-mode runs (benchmarks, tests) are never profiled
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return None
+    # A fragment rerun runs the fragment alone, without `begin()` or `finish()`, so it has a run of its own
+    return st.session_state.get(_FRAGMENT_KEY if ctx.fragment_ids_this_run else _STATE_KEY)
+
+
+def _begin_fragment():
+    # Starts the run of a fragment rerun when the profiled fragment function is entered, under the full run's page
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None or not ctx.fragment_ids_this_run or st.session_state.get(_FRAGMENT_KEY) is not None:
+        return None
+    parent = st.session_state.get(_STATE_KEY)
+    if parent is None:
+        return None
+    run = _Run(parent.page, parent.session, ctx.current_fragment_id)
+    st.session_state[_FRAGMENT_KEY] = run
+    return run
+
+
+def begin(page):
+    """
+    Start profiling a run of `page` when this session is profiled; call it once per full run.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return
+    enabled = _enabled(os.environ.get(ENABLE_VARIABLE)) or _enabled(st.query_params.get("profile"))
+    st.session_state[_STATE_KEY] = _Run(page, ctx.session_id) if enabled else None
+
+
+def section(name):
+    """
+    Start the section `name` of a script-style page; it runs until the next `section()` or `finish()`.
+    """
+    run = _current()
+    if run is None:
+        return
+    if run.lap is not None:
+        run.close(run.lap)
+    run.lap = _Section(name)
+
+
+def profiled(func):
+    """
+    Decorator profiling every call of a view function as a section named after it.
+
+    Put it under `@st.fragment`, so a rerun of the fragment alone is profiled as a run of its own.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        fragment_run = _begin_fragment()
+        run = _current()
+        if run is None:
+            return func(*args, **kwargs)
+        run.stack.append(_Section(func.__name__))
+        try:
+            return func(*args, **kwargs)
+        finally:
+            run.close(run.stack.pop())
+            if fragment_run is not None:
+                del st.session_state[_FRAGMENT_KEY]
+
+    return wrapper
+
+
+def record_figure(hit, seconds, payload_bytes):
+    """
+    Count a figure in the open section: served from the cache or built, and its JSON size.
+    """
+    run = _current()
+    section = run.current() if run else None
+    if section is None:
+        return
+    section.figures += 1
+    section.cache_hits += hit
+    section.build_seconds += seconds
+    section.payload_bytes += payload_bytes
+
+
+def finish():
+    """
+    Close the open section and show the run's sections and cache counters in a sidebar panel.
+    """
+    run = _current()
+    if run is None:
+        return
+    # Imported here, so apps that never profile do not load pandas, Plotly and Arrow just for this
+    import pandas as pd
+
+    from utils.export import EXPORTS
+    from utils.figure_cache import FIGURES
+
+    if run.lap is not None:
+        run.close(run.lap)
+        run.lap = None
+
+    with st.sidebar.expander("Performance", expanded=False):
+        if run.records:
+            table = pd.DataFrame(run.records)
+            st.caption(f"{table['seconds'].sum():.3f} s in {len(table)} sections, "
+                       f"{table['payload_bytes'].sum() / 1024:,.1f} KB of figures")
+            table = table[["section", "compute_seconds", "build_seconds", "payload_bytes", "figures", "cache_hits"]]
+            st.dataframe(table.rename(columns={"compute_seconds": "compute s", "build_seconds": "figure s",
+                                               "payload_bytes": "bytes", "cache_hits": "hits"}), hide_index=True)
+        for label, cache in (("Figure cache", FIGURES), ("Export cache", EXPORTS)):
+            stats = cache.stats()
+            st.caption(f"{label}: {stats['hits']:,} hits, {stats['misses']:,} misses, {stats['evictions']:,} evictions, "
+                       f"{stats['entries']:,} entries, {stats['bytes'] / 2**20:,.1f} of {stats['max_bytes'] / 2**20:,.0f} MB")
+        st.caption(f"Sections are also logged to {os.environ.get(LOG_VARIABLE, DEFAULT_LOG_PATH)}")
@@ -0,0 +1,29 @@
+class RankedCounts:
+    """
+    Non-missing `count_column` entries counted per `column` value, ranked once so pages and lookups are slices.
+    """
+
+    def __init__(self, df, column, count_column, label=None, count_label=None):
+        self.label = label or column
+        table = df.groupby(column, observed=True)[count_column].count().reset_index().sort_values(by=count_column, ascending=False)
+        self.table = table.rename(columns={column: self.label, count_column: count_label or count_column}).reset_index(drop=True)
+        self.ranks = {value: rank for rank, value in enumerate(self.table[self.label])}
+
+    def __len__(self):
+        return len(self.table)
+
+    def page(self, number, page_size):
+        """
+        Return page `number` (counted from 1) of the ranked table.
+        """
+        start = (number - 1) * page_size
+        return self.table.iloc[start:start + page_size]
+
+    def lookup(self, value):
+        """
+        Return the one-row table of `value`, or an empty table when it has no count.
+        """
+        rank = self.ranks.get(value)
+        if rank is None:
+            return self.table.iloc[:0]
+        return self.table.iloc[rank:rank + 1]
@@ -0,0 +1,47 @@
+import numpy as np
+import plotly.express as px
+
+POINT_BUDGET = 5000
+GRID_BINS = 32
+
+
+def _bin(values, bins):
+    # Map values onto `bins` equal-width bins spanning their range
+    lo, hi = values.min(), values.max()
+    if hi <= lo:
+        return np.zeros(len(values), dtype=np.int64)
+    return np.clip(((values - lo) / (hi - lo) * bins).astype(np.int64), 0, bins - 1)
+
+
+def sample_points(df, x, y, budget=POINT_BUDGET, seed=0, bins=GRID_BINS):
+    """
+    Return about `budget` rows of `df`, stratified over an x/y grid so the scatter keeps the data's shape.
+    """
+    if len(df) <= budget:
+        return df
+    xs = df[x].to_numpy(dtype=float)
+    ys = df[y].to_numpy(dtype=float)
+    positions = np.flatnonzero(np.isfinite(xs) & np.isfinite(ys))
+    if len(positions) <= budget:
+        return df.iloc[positions]
+    cells = _bin(xs[positions], bins) * bins + _bin(ys[positions], bins)
+
+    # Shuffle, then rank the rows within their cell and keep each cell's quota of the first ranks
+    shuffled = np.random.default_rng(seed).permutation(len(positions))
+    order = shuffled[np.argsort(cells[shuffled], kind="stable")]
+    ordered = cells[order]
+    rank = np.arange(len(order)) - np.searchsorted(ordered, ordered, side="left")
+    counts = np.bincount(cells, minlength=bins * bins)
+    quota = np.maximum(1, np.floor(counts * budget / len(positions)))
+    keep = order[rank < quota[ordered]]
+    return df.iloc[np.sort(positions[keep])]
+
+
+def budgeted_scatter(df, x, y, budget=POINT_BUDGET, seed=0, **kwargs):
+    """
+    Build a `px.scatter` of at most about `budget` points and return it with the number of rows drawn.
+    """
+    if len(df) <= budget:
+        return px.scatter(df, x=x, y=y, **kwargs), len(df)
+    sample = sample_points(df, x, y, budget, seed)
+    return px.scatter(sample, x=x, y=y, render_mode="webgl", **kwargs), len(sample)
@@ -0,0 +1,60 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+def _read_only_frame(df):
+    """
+    Rebuild `df` on top of read-only column arrays without copying them.
+    """
+    columns = {}
+    for name, column in df.items():
+        if isinstance(column.dtype, np.dtype):
+            values = column.to_numpy()
+            values.flags.writeable = False
+            columns[name] = values
+        else:
+            # Extension arrays (categoricals, periods, ...) are shared as they are
+            columns[name] = column.array
+    return pd.DataFrame(columns, copy=False)
+
+
+def _table_digest(table):
+    """
+    Return a short hash of an Arrow table's schema and column buffers.
+    """
+    digest = hashlib.sha256(table.schema.to_string().encode("utf-8"))
+    for column in table.columns:
+        for chunk in column.chunks:
+            # A dictionary array's buffers are its indices; its labels live in the dictionary
+            arrays = [chunk, chunk.dictionary] if pa.types.is_dictionary(chunk.type) else [chunk]
+            for array in arrays:
+                for buffer in array.buffers():
+                    if buffer is not None:
+                        digest.update(buffer)
+    return digest.hexdigest()[:16]
+
+
+# Hold one per process (e.g. via `st.cache_resource`): `st.cache_data` would hand every rerun its own copy
+class SharedFrame:
+    """
+    Immutable Arrow-backed dataset shared by every session, with a content `version` for cache keys.
+    """
+
+    def __init__(self, df):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        self.version = _table_digest(table)
+        # Numeric columns are zero-copy views of the Arrow buffers, which pyarrow already marks read-only.
+        # The table is not kept: other columns are converted to pandas copies, which it would hold twice
+        self._frame = _read_only_frame(table.to_pandas(split_blocks=True))
+
+    def __len__(self):
+        return len(self._frame)
+
+    def view(self):
+        """
+        Return a shallow view of the shared frame; new columns stay local and writes to shared ones raise.
+        """
+        return self._frame.copy(deep=False)
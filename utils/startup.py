@@ -0,0 +1,63 @@
+import os
+import sys
+import threading
+import time
+
+from streamlit.logger import get_logger
+
+# Seconds a cold start may take to import the app and run a first page that shows no data
+STARTUP_BUDGET_SECONDS = 0.5
+
+# Modules only the data pages need; the navigation and the About Me page must not import them.
+# (Streamlit itself imports plotly.graph_objects, which loads its classes lazily, and numpy for st.image.)
+HEAVY_MODULES = ("pandas", "pyarrow", "plotly.express", "plotly.figure_factory", "scipy")
+
+_LOGGER = get_logger(__name__)
+_lock = threading.Lock()
+_reported = False
+
+
+def heavy_modules():
+    """
+    Return the heavy modules imported so far in this process.
+    """
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def process_seconds():
+    """
+    Return the seconds since this process started, or None where /proc is not available.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # The command name (field 2) may contain spaces, so fields are counted after it: start time is field 22
+            fields = f.read().rsplit(")", 1)[1].split()
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - started
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def report_startup(import_seconds, page, page_seconds, data_page, budget=STARTUP_BUDGET_SECONDS):
+    """
+    Log, once per process, the time since the interpreter started and the app's share of it against the startup budget.
+    """
+    # `import_seconds` only covers the app's own imports: the server imported Streamlit before the first run.
+    # The process time also covers that, the server's start and any wait for the first session to connect
+    global _reported
+    with _lock:
+        if _reported:
+            return
+        _reported = True
+    loaded = heavy_modules()
+    total = import_seconds + page_seconds
+    started = process_seconds()
+    _LOGGER.info("Startup: %s s from process start to the end of the first run; app imports %.3f s, "
+                 "first run of %s %.3f s, heavy modules loaded: %s", "?" if started is None else f"{started:.3f}",
+                 import_seconds, page, page_seconds, ", ".join(loaded) or "none")
+    if data_page:
+        return
+    if total > budget:
+        _LOGGER.warning("Startup: %.3f s to import the app and run %s, over the %.3f s budget", total, page, budget)
+    if loaded:
+        _LOGGER.warning("Startup: %s imported %s before any data page was opened", page, ", ".join(loaded))